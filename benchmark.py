@@ -1,813 +1,852 @@
 
-import sys, os
-sys.path.insert(0, "cactus/python/src")
-os.environ["CACTUS_NO_CLOUD_TELE"] = "1"
-
+import sys, os, time
+import asyncio
+from sys import intern
+import functools
+from dataclasses import dataclass, field
+from collections import Counter, defaultdict, namedtuple
 import json
-from main import generate_hybrid
+from hashlib import blake2b
+from types import MappingProxyType
+from collections.abc import Mapping, KeysView, ItemsView, ValuesView
+
+try:
+    import orjson
+
+    def _canonical_json(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str)
+except ImportError:
+    def _canonical_json(obj):
+        return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+@functools.cache
+def _import_main():
+    """Import the cactus-backed main module on first use, not at module import."""
+    if "cactus/python/src" not in sys.path:
+        sys.path.insert(0, "cactus/python/src")
+    os.environ.setdefault("CACTUS_NO_CLOUD_TELE", "1")
+    import main
+    return main
+
+
+def _get_generate():
+    """generate_hybrid from main, imported on first use."""
+    return _import_main().generate_hybrid
 
 
 ############## Tool definitions ##############
 
-TOOL_GET_WEATHER = {
-    "name": "get_weather",
-    "description": "Get current weather for a location",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "location": {"type": "string", "description": "City name"}
-        },
-        "required": ["location"],
-    },
-}
-
-TOOL_SET_ALARM = {
-    "name": "set_alarm",
-    "description": "Set an alarm for a given time",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "hour": {"type": "integer", "description": "Hour to set the alarm for"},
-            "minute": {"type": "integer", "description": "Minute to set the alarm for"},
-        },
-        "required": ["hour", "minute"],
-    },
-}
-
-TOOL_SEND_MESSAGE = {
-    "name": "send_message",
-    "description": "Send a message to a contact",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "recipient": {"type": "string", "description": "Name of the person to send the message to"},
-            "message": {"type": "string", "description": "The message content to send"},
-        },
-        "required": ["recipient", "message"],
-    },
-}
-
-TOOL_CREATE_REMINDER = {
-    "name": "create_reminder",
-    "description": "Create a reminder with a title and time",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string", "description": "Reminder title"},
-            "time": {"type": "string", "description": "Time for the reminder (e.g. 3:00 PM)"},
-        },
-        "required": ["title", "time"],
-    },
-}
-
-TOOL_SEARCH_CONTACTS = {
-    "name": "search_contacts",
-    "description": "Search for a contact by name",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "query": {"type": "string", "description": "Name to search for"},
-        },
-        "required": ["query"],
-    },
-}
-
-TOOL_PLAY_MUSIC = {
-    "name": "play_music",
-    "description": "Play a song or playlist",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "song": {"type": "string", "description": "Song or playlist name"},
-        },
-        "required": ["song"],
-    },
-}
-
-TOOL_SET_TIMER = {
-    "name": "set_timer",
-    "description": "Set a countdown timer",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "minutes": {"type": "integer", "description": "Number of minutes"},
+Param = namedtuple("Param", "name type desc required", defaults=(True,))
+
+
+def _tool(name, desc, params):
+    """
+    Build a read-only tool schema from a name, description and Param list.
+    Strings are interned so phrases repeated across tools share one object.
+    """
+    return MappingProxyType({
+        "name": intern(name),
+        "description": intern(desc),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                intern(p.name): {"type": intern(p.type), "description": intern(p.desc)} for p in params
+            },
+            "required": [intern(p.name) for p in params if p.required],
         },
-        "required": ["minutes"],
-    },
-}
+    })
+
+
+TOOL_GET_WEATHER = _tool("get_weather", "Get current weather for a location", [
+    Param("location", "string", "City name"),
+])
+
+TOOL_SET_ALARM = _tool("set_alarm", "Set an alarm for a given time", [
+    Param("hour", "integer", "Hour to set the alarm for"),
+    Param("minute", "integer", "Minute to set the alarm for"),
+])
+
+TOOL_SEND_MESSAGE = _tool("send_message", "Send a message to a contact", [
+    Param("recipient", "string", "Name of the person to send the message to"),
+    Param("message", "string", "The message content to send"),
+])
+
+TOOL_CREATE_REMINDER = _tool("create_reminder", "Create a reminder with a title and time", [
+    Param("title", "string", "Reminder title"),
+    Param("time", "string", "Time for the reminder (e.g. 3:00 PM)"),
+])
+
+TOOL_SEARCH_CONTACTS = _tool("search_contacts", "Search for a contact by name", [
+    Param("query", "string", "Name to search for"),
+])
+
+TOOL_PLAY_MUSIC = _tool("play_music", "Play a song or playlist", [
+    Param("song", "string", "Song or playlist name"),
+])
+
+TOOL_SET_TIMER = _tool("set_timer", "Set a countdown timer", [
+    Param("minutes", "integer", "Number of minutes"),
+])
 
 # ===== NEW DOMAIN TOOLS =====
 
-TOOL_TURN_ON_LIGHT = {
-    "name": "turn_on_light",
-    "description": "Turn on a light in a specific room",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "room": {"type": "string", "description": "Room name"},
-        },
-        "required": ["room"],
-    },
-}
-
-TOOL_SET_THERMOSTAT = {
-    "name": "set_thermostat",
-    "description": "Set the thermostat temperature",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "temperature": {"type": "integer", "description": "Temperature in degrees"},
-        },
-        "required": ["temperature"],
-    },
-}
-
-TOOL_GET_DIRECTIONS = {
-    "name": "get_directions",
-    "description": "Get driving directions to a destination",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "destination": {"type": "string", "description": "Destination address or place"},
-        },
-        "required": ["destination"],
-    },
-}
-
-TOOL_FIND_RESTAURANT = {
-    "name": "find_restaurant",
-    "description": "Find a restaurant nearby",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "cuisine": {"type": "string", "description": "Type of cuisine"},
-        },
-        "required": ["cuisine"],
-    },
-}
-
-TOOL_LOG_WORKOUT = {
-    "name": "log_workout",
-    "description": "Log a workout session",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "activity": {"type": "string", "description": "Type of exercise"},
-            "duration": {"type": "integer", "description": "Duration in minutes"},
-        },
-        "required": ["activity", "duration"],
-    },
-}
-
-TOOL_CREATE_EVENT = {
-    "name": "create_event",
-    "description": "Create a calendar event",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string", "description": "Event title"},
-            "time": {"type": "string", "description": "Event time"},
-        },
-        "required": ["title", "time"],
-    },
-}
-
-TOOL_TRANSLATE_TEXT = {
-    "name": "translate_text",
-    "description": "Translate text to another language",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "text": {"type": "string", "description": "Text to translate"},
-            "language": {"type": "string", "description": "Target language"},
-        },
-        "required": ["text", "language"],
-    },
-}
-
-TOOL_ADD_TO_CART = {
-    "name": "add_to_cart",
-    "description": "Add an item to the shopping cart",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "item": {"type": "string", "description": "Product name"},
-            "quantity": {"type": "integer", "description": "Number of items"},
-        },
-        "required": ["item", "quantity"],
-    },
-}
-
-TOOL_CHECK_ORDER = {
-    "name": "check_order_status",
-    "description": "Check the status of an order",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "order_id": {"type": "string", "description": "Order ID number"},
-        },
-        "required": ["order_id"],
-    },
-}
-
-TOOL_BOOK_RIDE = {
-    "name": "book_ride",
-    "description": "Book a ride to a destination",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "destination": {"type": "string", "description": "Where to go"},
-            "ride_type": {"type": "string", "description": "Type of ride (economy, premium)"},
-        },
-        "required": ["destination", "ride_type"],
-    },
-}
-
-TOOL_SET_VOLUME = {
-    "name": "set_volume",
-    "description": "Set the speaker volume level",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "level": {"type": "integer", "description": "Volume level from 0 to 100"},
-        },
-        "required": ["level"],
-    },
-}
-
-TOOL_LOCK_DOOR = {
-    "name": "lock_door",
-    "description": "Lock a specific door",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "door": {"type": "string", "description": "Which door to lock"},
-        },
-        "required": ["door"],
-    },
-}
-
-TOOL_READ_NEWS = {
-    "name": "read_news",
-    "description": "Read latest news headlines for a topic",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "topic": {"type": "string", "description": "News topic or category"},
-        },
-        "required": ["topic"],
-    },
-}
-
-TOOL_TAKE_NOTE = {
-    "name": "take_note",
-    "description": "Save a note with a title and content",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string", "description": "Note title"},
-            "content": {"type": "string", "description": "Note body text"},
-        },
-        "required": ["title", "content"],
-    },
-}
-
-TOOL_CONVERT_CURRENCY = {
-    "name": "convert_currency",
-    "description": "Convert an amount between currencies",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "amount": {"type": "number", "description": "Amount to convert"},
-            "from_currency": {"type": "string", "description": "Source currency code"},
-            "to_currency": {"type": "string", "description": "Target currency code"},
-        },
-        "required": ["amount", "from_currency", "to_currency"],
-    },
-}
+TOOL_TURN_ON_LIGHT = _tool("turn_on_light", "Turn on a light in a specific room", [
+    Param("room", "string", "Room name"),
+])
+
+TOOL_SET_THERMOSTAT = _tool("set_thermostat", "Set the thermostat temperature", [
+    Param("temperature", "integer", "Temperature in degrees"),
+])
+
+TOOL_GET_DIRECTIONS = _tool("get_directions", "Get driving directions to a destination", [
+    Param("destination", "string", "Destination address or place"),
+])
+
+TOOL_FIND_RESTAURANT = _tool("find_restaurant", "Find a restaurant nearby", [
+    Param("cuisine", "string", "Type of cuisine"),
+])
+
+TOOL_LOG_WORKOUT = _tool("log_workout", "Log a workout session", [
+    Param("activity", "string", "Type of exercise"),
+    Param("duration", "integer", "Duration in minutes"),
+])
+
+TOOL_CREATE_EVENT = _tool("create_event", "Create a calendar event", [
+    Param("title", "string", "Event title"),
+    Param("time", "string", "Event time"),
+])
+
+TOOL_TRANSLATE_TEXT = _tool("translate_text", "Translate text to another language", [
+    Param("text", "string", "Text to translate"),
+    Param("language", "string", "Target language"),
+])
+
+TOOL_ADD_TO_CART = _tool("add_to_cart", "Add an item to the shopping cart", [
+    Param("item", "string", "Product name"),
+    Param("quantity", "integer", "Number of items"),
+])
+
+TOOL_CHECK_ORDER = _tool("check_order_status", "Check the status of an order", [
+    Param("order_id", "string", "Order ID number"),
+])
+
+TOOL_BOOK_RIDE = _tool("book_ride", "Book a ride to a destination", [
+    Param("destination", "string", "Where to go"),
+    Param("ride_type", "string", "Type of ride (economy, premium)"),
+])
+
+TOOL_SET_VOLUME = _tool("set_volume", "Set the speaker volume level", [
+    Param("level", "integer", "Volume level from 0 to 100"),
+])
+
+TOOL_LOCK_DOOR = _tool("lock_door", "Lock a specific door", [
+    Param("door", "string", "Which door to lock"),
+])
+
+TOOL_READ_NEWS = _tool("read_news", "Read latest news headlines for a topic", [
+    Param("topic", "string", "News topic or category"),
+])
+
+TOOL_TAKE_NOTE = _tool("take_note", "Save a note with a title and content", [
+    Param("title", "string", "Note title"),
+    Param("content", "string", "Note body text"),
+])
+
+TOOL_CONVERT_CURRENCY = _tool("convert_currency", "Convert an amount between currencies", [
+    Param("amount", "number", "Amount to convert"),
+    Param("from_currency", "string", "Source currency code"),
+    Param("to_currency", "string", "Target currency code"),
+])
+
+# Tool dicts are read-only views; BENCHMARKS share them by identity.
+_ALL_TOOLS = (
+    TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_SEND_MESSAGE, TOOL_CREATE_REMINDER,
+    TOOL_SEARCH_CONTACTS, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_TURN_ON_LIGHT,
+    TOOL_SET_THERMOSTAT, TOOL_GET_DIRECTIONS, TOOL_FIND_RESTAURANT, TOOL_LOG_WORKOUT,
+    TOOL_CREATE_EVENT, TOOL_TRANSLATE_TEXT, TOOL_ADD_TO_CART, TOOL_CHECK_ORDER,
+    TOOL_BOOK_RIDE, TOOL_SET_VOLUME, TOOL_LOCK_DOOR, TOOL_READ_NEWS, TOOL_TAKE_NOTE,
+    TOOL_CONVERT_CURRENCY,
+)
+_TOOL_BIT = {t["name"]: 1 << i for i, t in enumerate(_ALL_TOOLS)}
 
 
 ############## Benchmark cases ##############
 
-BENCHMARKS = [
+def _normalize(v):
+    """Normalize a value for comparison."""
+    if isinstance(v, str):
+        return v.strip().lower()
+    return v
+
+
+def _fingerprint(call):
+    """Canonical JSON bytes of a call's name and normalized arguments."""
+    args = {k: _normalize(v) for k, v in call.get("arguments", {}).items()}
+    return _canonical_json([call["name"], args])
+
+
+def _compile_expected(expected_calls):
+    """Precompute (fingerprint, name, normalized argument items) per expected call."""
+    return tuple(
+        (_fingerprint(c), intern(c["name"]), tuple((k, _normalize(v)) for k, v in c.get("arguments", {}).items()))
+        for c in expected_calls
+    )
+
+
+def _matches_compiled(predicted, name, arg_items):
+    """Check if a predicted call matches a compiled expected call (name + argument values)."""
+    if predicted["name"] != name:
+        return False
+    pred_args = predicted.get("arguments", {})
+    for key, exp_val in arg_items:
+        if key not in pred_args or _normalize(pred_args[key]) != exp_val:
+            return False
+    return True
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class BenchmarkCase:
+    name: str
+    difficulty: str
+    prompt: str
+    tools: tuple
+    expected_calls: tuple
+    expected_compiled: tuple = field(init=False)
+
+    def __post_init__(self):
+        # Canonical tool order, so cases sharing tools send identical prompt prefixes
+        object.__setattr__(self, "tools", tuple(sorted(self.tools, key=lambda t: t["name"])))
+        # Expected calls as plain (JSON-serializable) dicts in a tuple, with tool
+        # names sharing the schemas' interned strings
+        expected = tuple(
+            {"name": intern(c["name"]), "arguments": dict(c.get("arguments", {}))}
+            for c in self.expected_calls
+        )
+        object.__setattr__(self, "expected_calls", expected)
+        object.__setattr__(self, "expected_compiled", _compile_expected(expected))
+
+    @property
+    def messages(self):
+        """Single-turn chat messages for generate_hybrid, built on demand."""
+        return [{"role": "user", "content": self.prompt}]
+
+    @property
+    def tools_signature(self):
+        """Key identifying the case's tool set (tools are kept sorted by name)."""
+        return tuple(t["name"] for t in self.tools)
+
+    # Read-only Mapping over the original case keys, for test_stress.py and
+    # external harnesses that index cases as case["messages"], case["tools"], ...
+    # Registered rather than subclassed so cases keep identity equality and hashing.
+    _KEYS = ("name", "difficulty", "messages", "tools", "expected_calls")
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return list(value) if isinstance(value, tuple) else value
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def get(self, key, default=None):
+        return self[key] if key in self._KEYS else default
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+
+Mapping.register(BenchmarkCase)
+
+
+def _as_case(case):
+    """Accept a BenchmarkCase or a case dict in the original format."""
+    if isinstance(case, BenchmarkCase):
+        return case
+    messages = case["messages"]
+    if len(messages) != 1 or messages[0].get("role") != "user":
+        raise ValueError(f"benchmark case {case.get('name')!r} must be a single user message")
+    return BenchmarkCase(
+        name=case["name"],
+        difficulty=case["difficulty"],
+        prompt=messages[0]["content"],
+        tools=tuple(case["tools"]),
+        expected_calls=case["expected_calls"],
+    )
+
+
+# A tuple of BenchmarkCase records, not the original list of dicts. Each case
+# is still a read-only Mapping with the original keys (case["messages"],
+# case["expected_calls"], ...) and its expected calls are plain dicts;
+# run_benchmark and compare_backends also accept original-format case dicts.
+BENCHMARKS = (
     # ===== Easy: 1 tool, direct request =====
-    {
-        "name": "weather_sf",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "What is the weather in San Francisco?"}],
-        "tools": [TOOL_GET_WEATHER],
-        "expected_calls": [{"name": "get_weather", "arguments": {"location": "San Francisco"}}],
-    },
-    {
-        "name": "alarm_10am",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Set an alarm for 10 AM."}],
-        "tools": [TOOL_SET_ALARM],
-        "expected_calls": [{"name": "set_alarm", "arguments": {"hour": 10, "minute": 0}}],
-    },
-    {
-        "name": "message_alice",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Send a message to Alice saying good morning."}],
-        "tools": [TOOL_SEND_MESSAGE],
-        "expected_calls": [{"name": "send_message", "arguments": {"recipient": "Alice", "message": "good morning"}}],
-    },
-    {
-        "name": "weather_london",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "What's the weather like in London?"}],
-        "tools": [TOOL_GET_WEATHER],
-        "expected_calls": [{"name": "get_weather", "arguments": {"location": "London"}}],
-    },
-    {
-        "name": "alarm_6am",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Wake me up at 6 AM."}],
-        "tools": [TOOL_SET_ALARM],
-        "expected_calls": [{"name": "set_alarm", "arguments": {"hour": 6, "minute": 0}}],
-    },
-    {
-        "name": "play_bohemian",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Play Bohemian Rhapsody."}],
-        "tools": [TOOL_PLAY_MUSIC],
-        "expected_calls": [{"name": "play_music", "arguments": {"song": "Bohemian Rhapsody"}}],
-    },
-    {
-        "name": "timer_5min",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Set a timer for 5 minutes."}],
-        "tools": [TOOL_SET_TIMER],
-        "expected_calls": [{"name": "set_timer", "arguments": {"minutes": 5}}],
-    },
-    {
-        "name": "reminder_meeting",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Remind me about the meeting at 3:00 PM."}],
-        "tools": [TOOL_CREATE_REMINDER],
-        "expected_calls": [{"name": "create_reminder", "arguments": {"title": "meeting", "time": "3:00 PM"}}],
-    },
-    {
-        "name": "search_bob",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "Find Bob in my contacts."}],
-        "tools": [TOOL_SEARCH_CONTACTS],
-        "expected_calls": [{"name": "search_contacts", "arguments": {"query": "Bob"}}],
-    },
-    {
-        "name": "weather_paris",
-        "difficulty": "easy",
-        "messages": [{"role": "user", "content": "How's the weather in Paris?"}],
-        "tools": [TOOL_GET_WEATHER],
-        "expected_calls": [{"name": "get_weather", "arguments": {"location": "Paris"}}],
-    },
+    BenchmarkCase(
+        name="weather_sf",
+        difficulty="easy",
+        prompt="What is the weather in San Francisco?",
+        tools=(TOOL_GET_WEATHER,),
+        expected_calls=[{"name": "get_weather", "arguments": {"location": "San Francisco"}}],
+    ),
+    BenchmarkCase(
+        name="alarm_10am",
+        difficulty="easy",
+        prompt="Set an alarm for 10 AM.",
+        tools=(TOOL_SET_ALARM,),
+        expected_calls=[{"name": "set_alarm", "arguments": {"hour": 10, "minute": 0}}],
+    ),
+    BenchmarkCase(
+        name="message_alice",
+        difficulty="easy",
+        prompt="Send a message to Alice saying good morning.",
+        tools=(TOOL_SEND_MESSAGE,),
+        expected_calls=[{"name": "send_message", "arguments": {"recipient": "Alice", "message": "good morning"}}],
+    ),
+    BenchmarkCase(
+        name="weather_london",
+        difficulty="easy",
+        prompt="What's the weather like in London?",
+        tools=(TOOL_GET_WEATHER,),
+        expected_calls=[{"name": "get_weather", "arguments": {"location": "London"}}],
+    ),
+    BenchmarkCase(
+        name="alarm_6am",
+        difficulty="easy",
+        prompt="Wake me up at 6 AM.",
+        tools=(TOOL_SET_ALARM,),
+        expected_calls=[{"name": "set_alarm", "arguments": {"hour": 6, "minute": 0}}],
+    ),
+    BenchmarkCase(
+        name="play_bohemian",
+        difficulty="easy",
+        prompt="Play Bohemian Rhapsody.",
+        tools=(TOOL_PLAY_MUSIC,),
+        expected_calls=[{"name": "play_music", "arguments": {"song": "Bohemian Rhapsody"}}],
+    ),
+    BenchmarkCase(
+        name="timer_5min",
+        difficulty="easy",
+        prompt="Set a timer for 5 minutes.",
+        tools=(TOOL_SET_TIMER,),
+        expected_calls=[{"name": "set_timer", "arguments": {"minutes": 5}}],
+    ),
+    BenchmarkCase(
+        name="reminder_meeting",
+        difficulty="easy",
+        prompt="Remind me about the meeting at 3:00 PM.",
+        tools=(TOOL_CREATE_REMINDER,),
+        expected_calls=[{"name": "create_reminder", "arguments": {"title": "meeting", "time": "3:00 PM"}}],
+    ),
+    BenchmarkCase(
+        name="search_bob",
+        difficulty="easy",
+        prompt="Find Bob in my contacts.",
+        tools=(TOOL_SEARCH_CONTACTS,),
+        expected_calls=[{"name": "search_contacts", "arguments": {"query": "Bob"}}],
+    ),
+    BenchmarkCase(
+        name="weather_paris",
+        difficulty="easy",
+        prompt="How's the weather in Paris?",
+        tools=(TOOL_GET_WEATHER,),
+        expected_calls=[{"name": "get_weather", "arguments": {"location": "Paris"}}],
+    ),
 
     # ===== Medium: 2-3 tools, must pick the right one =====
-    {
-        "name": "message_among_three",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Send a message to John saying hello."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_SEND_MESSAGE, TOOL_SET_ALARM],
-        "expected_calls": [{"name": "send_message", "arguments": {"recipient": "John", "message": "hello"}}],
-    },
-    {
-        "name": "weather_among_two",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "What's the weather in Tokyo?"}],
-        "tools": [TOOL_GET_WEATHER, TOOL_SEND_MESSAGE],
-        "expected_calls": [{"name": "get_weather", "arguments": {"location": "Tokyo"}}],
-    },
-    {
-        "name": "alarm_among_three",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Set an alarm for 8:15 AM."}],
-        "tools": [TOOL_SEND_MESSAGE, TOOL_SET_ALARM, TOOL_GET_WEATHER],
-        "expected_calls": [{"name": "set_alarm", "arguments": {"hour": 8, "minute": 15}}],
-    },
-    {
-        "name": "music_among_three",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Play some jazz music."}],
-        "tools": [TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_GET_WEATHER],
-        "expected_calls": [{"name": "play_music", "arguments": {"song": "jazz"}}],
-    },
-    {
-        "name": "reminder_among_four",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Remind me to call the dentist at 2:00 PM."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_SEND_MESSAGE, TOOL_CREATE_REMINDER, TOOL_SET_ALARM],
-        "expected_calls": [{"name": "create_reminder", "arguments": {"title": "call the dentist", "time": "2:00 PM"}}],
-    },
-    {
-        "name": "timer_among_three",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Set a timer for 10 minutes."}],
-        "tools": [TOOL_SET_ALARM, TOOL_SET_TIMER, TOOL_PLAY_MUSIC],
-        "expected_calls": [{"name": "set_timer", "arguments": {"minutes": 10}}],
-    },
-    {
-        "name": "search_among_four",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Look up Sarah in my contacts."}],
-        "tools": [TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SEARCH_CONTACTS, TOOL_SET_ALARM],
-        "expected_calls": [{"name": "search_contacts", "arguments": {"query": "Sarah"}}],
-    },
-    {
-        "name": "weather_among_four",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "What's the weather in Berlin?"}],
-        "tools": [TOOL_SEND_MESSAGE, TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_GET_WEATHER],
-        "expected_calls": [{"name": "get_weather", "arguments": {"location": "Berlin"}}],
-    },
-    {
-        "name": "message_among_four",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Text Dave saying I'll be late."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_SET_TIMER, TOOL_SEND_MESSAGE, TOOL_PLAY_MUSIC],
-        "expected_calls": [{"name": "send_message", "arguments": {"recipient": "Dave", "message": "I'll be late"}}],
-    },
-    {
-        "name": "alarm_among_five",
-        "difficulty": "medium",
-        "messages": [{"role": "user", "content": "Set an alarm for 9 AM."}],
-        "tools": [TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_SET_ALARM],
-        "expected_calls": [{"name": "set_alarm", "arguments": {"hour": 9, "minute": 0}}],
-    },
+    BenchmarkCase(
+        name="message_among_three",
+        difficulty="medium",
+        prompt="Send a message to John saying hello.",
+        tools=(TOOL_GET_WEATHER, TOOL_SEND_MESSAGE, TOOL_SET_ALARM),
+        expected_calls=[{"name": "send_message", "arguments": {"recipient": "John", "message": "hello"}}],
+    ),
+    BenchmarkCase(
+        name="weather_among_two",
+        difficulty="medium",
+        prompt="What's the weather in Tokyo?",
+        tools=(TOOL_GET_WEATHER, TOOL_SEND_MESSAGE),
+        expected_calls=[{"name": "get_weather", "arguments": {"location": "Tokyo"}}],
+    ),
+    BenchmarkCase(
+        name="alarm_among_three",
+        difficulty="medium",
+        prompt="Set an alarm for 8:15 AM.",
+        tools=(TOOL_SEND_MESSAGE, TOOL_SET_ALARM, TOOL_GET_WEATHER),
+        expected_calls=[{"name": "set_alarm", "arguments": {"hour": 8, "minute": 15}}],
+    ),
+    BenchmarkCase(
+        name="music_among_three",
+        difficulty="medium",
+        prompt="Play some jazz music.",
+        tools=(TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_GET_WEATHER),
+        expected_calls=[{"name": "play_music", "arguments": {"song": "jazz"}}],
+    ),
+    BenchmarkCase(
+        name="reminder_among_four",
+        difficulty="medium",
+        prompt="Remind me to call the dentist at 2:00 PM.",
+        tools=(TOOL_GET_WEATHER, TOOL_SEND_MESSAGE, TOOL_CREATE_REMINDER, TOOL_SET_ALARM),
+        expected_calls=[{"name": "create_reminder", "arguments": {"title": "call the dentist", "time": "2:00 PM"}}],
+    ),
+    BenchmarkCase(
+        name="timer_among_three",
+        difficulty="medium",
+        prompt="Set a timer for 10 minutes.",
+        tools=(TOOL_SET_ALARM, TOOL_SET_TIMER, TOOL_PLAY_MUSIC),
+        expected_calls=[{"name": "set_timer", "arguments": {"minutes": 10}}],
+    ),
+    BenchmarkCase(
+        name="search_among_four",
+        difficulty="medium",
+        prompt="Look up Sarah in my contacts.",
+        tools=(TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SEARCH_CONTACTS, TOOL_SET_ALARM),
+        expected_calls=[{"name": "search_contacts", "arguments": {"query": "Sarah"}}],
+    ),
+    BenchmarkCase(
+        name="weather_among_four",
+        difficulty="medium",
+        prompt="What's the weather in Berlin?",
+        tools=(TOOL_SEND_MESSAGE, TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_GET_WEATHER),
+        expected_calls=[{"name": "get_weather", "arguments": {"location": "Berlin"}}],
+    ),
+    BenchmarkCase(
+        name="message_among_four",
+        difficulty="medium",
+        prompt="Text Dave saying I'll be late.",
+        tools=(TOOL_GET_WEATHER, TOOL_SET_TIMER, TOOL_SEND_MESSAGE, TOOL_PLAY_MUSIC),
+        expected_calls=[{"name": "send_message", "arguments": {"recipient": "Dave", "message": "I'll be late"}}],
+    ),
+    BenchmarkCase(
+        name="alarm_among_five",
+        difficulty="medium",
+        prompt="Set an alarm for 9 AM.",
+        tools=(TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_SET_ALARM),
+        expected_calls=[{"name": "set_alarm", "arguments": {"hour": 9, "minute": 0}}],
+    ),
 
     # ===== Hard: multiple tools needed, multi-call =====
-    {
-        "name": "message_and_weather",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Send a message to Bob saying hi and get the weather in London."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_SEND_MESSAGE, TOOL_SET_ALARM],
-        "expected_calls": [
+    BenchmarkCase(
+        name="message_and_weather",
+        difficulty="hard",
+        prompt="Send a message to Bob saying hi and get the weather in London.",
+        tools=(TOOL_GET_WEATHER, TOOL_SEND_MESSAGE, TOOL_SET_ALARM),
+        expected_calls=[
             {"name": "send_message", "arguments": {"recipient": "Bob", "message": "hi"}},
             {"name": "get_weather", "arguments": {"location": "London"}},
         ],
-    },
-    {
-        "name": "alarm_and_weather",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Set an alarm for 7:30 AM and check the weather in New York."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="alarm_and_weather",
+        difficulty="hard",
+        prompt="Set an alarm for 7:30 AM and check the weather in New York.",
+        tools=(TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "set_alarm", "arguments": {"hour": 7, "minute": 30}},
             {"name": "get_weather", "arguments": {"location": "New York"}},
         ],
-    },
-    {
-        "name": "timer_and_music",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Set a timer for 20 minutes and play lo-fi beats."}],
-        "tools": [TOOL_SET_TIMER, TOOL_PLAY_MUSIC, TOOL_GET_WEATHER, TOOL_SET_ALARM],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="timer_and_music",
+        difficulty="hard",
+        prompt="Set a timer for 20 minutes and play lo-fi beats.",
+        tools=(TOOL_SET_TIMER, TOOL_PLAY_MUSIC, TOOL_GET_WEATHER, TOOL_SET_ALARM),
+        expected_calls=[
             {"name": "set_timer", "arguments": {"minutes": 20}},
             {"name": "play_music", "arguments": {"song": "lo-fi beats"}},
         ],
-    },
-    {
-        "name": "reminder_and_message",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Remind me about groceries at 5:00 PM and text Lisa saying see you tonight."}],
-        "tools": [TOOL_CREATE_REMINDER, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_ALARM],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="reminder_and_message",
+        difficulty="hard",
+        prompt="Remind me about groceries at 5:00 PM and text Lisa saying see you tonight.",
+        tools=(TOOL_CREATE_REMINDER, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_ALARM),
+        expected_calls=[
             {"name": "create_reminder", "arguments": {"title": "groceries", "time": "5:00 PM"}},
             {"name": "send_message", "arguments": {"recipient": "Lisa", "message": "see you tonight"}},
         ],
-    },
-    {
-        "name": "search_and_message",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Find Tom in my contacts and send him a message saying happy birthday."}],
-        "tools": [TOOL_SEARCH_CONTACTS, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_PLAY_MUSIC],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="search_and_message",
+        difficulty="hard",
+        prompt="Find Tom in my contacts and send him a message saying happy birthday.",
+        tools=(TOOL_SEARCH_CONTACTS, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_PLAY_MUSIC),
+        expected_calls=[
             {"name": "search_contacts", "arguments": {"query": "Tom"}},
             {"name": "send_message", "arguments": {"recipient": "Tom", "message": "happy birthday"}},
         ],
-    },
-    {
-        "name": "alarm_and_reminder",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Set an alarm for 6:45 AM and remind me to take medicine at 7:00 AM."}],
-        "tools": [TOOL_SET_ALARM, TOOL_CREATE_REMINDER, TOOL_SEND_MESSAGE, TOOL_PLAY_MUSIC],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="alarm_and_reminder",
+        difficulty="hard",
+        prompt="Set an alarm for 6:45 AM and remind me to take medicine at 7:00 AM.",
+        tools=(TOOL_SET_ALARM, TOOL_CREATE_REMINDER, TOOL_SEND_MESSAGE, TOOL_PLAY_MUSIC),
+        expected_calls=[
             {"name": "set_alarm", "arguments": {"hour": 6, "minute": 45}},
             {"name": "create_reminder", "arguments": {"title": "take medicine", "time": "7:00 AM"}},
         ],
-    },
-    {
-        "name": "weather_and_music",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Check the weather in Miami and play summer hits."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="weather_and_music",
+        difficulty="hard",
+        prompt="Check the weather in Miami and play summer hits.",
+        tools=(TOOL_GET_WEATHER, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "get_weather", "arguments": {"location": "Miami"}},
             {"name": "play_music", "arguments": {"song": "summer hits"}},
         ],
-    },
-    {
-        "name": "message_weather_alarm",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Text Emma saying good night, check the weather in Chicago, and set an alarm for 5 AM."}],
-        "tools": [TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_SET_TIMER],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="message_weather_alarm",
+        difficulty="hard",
+        prompt="Text Emma saying good night, check the weather in Chicago, and set an alarm for 5 AM.",
+        tools=(TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_SET_TIMER),
+        expected_calls=[
             {"name": "send_message", "arguments": {"recipient": "Emma", "message": "good night"}},
             {"name": "get_weather", "arguments": {"location": "Chicago"}},
             {"name": "set_alarm", "arguments": {"hour": 5, "minute": 0}},
         ],
-    },
-    {
-        "name": "timer_music_reminder",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Set a 15 minute timer, play classical music, and remind me to stretch at 4:00 PM."}],
-        "tools": [TOOL_SET_TIMER, TOOL_PLAY_MUSIC, TOOL_CREATE_REMINDER, TOOL_GET_WEATHER, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="timer_music_reminder",
+        difficulty="hard",
+        prompt="Set a 15 minute timer, play classical music, and remind me to stretch at 4:00 PM.",
+        tools=(TOOL_SET_TIMER, TOOL_PLAY_MUSIC, TOOL_CREATE_REMINDER, TOOL_GET_WEATHER, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "set_timer", "arguments": {"minutes": 15}},
             {"name": "play_music", "arguments": {"song": "classical music"}},
             {"name": "create_reminder", "arguments": {"title": "stretch", "time": "4:00 PM"}},
         ],
-    },
-    {
-        "name": "search_message_weather",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Look up Jake in my contacts, send him a message saying let's meet, and check the weather in Seattle."}],
-        "tools": [TOOL_SEARCH_CONTACTS, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_PLAY_MUSIC],
-        "expected_calls": [
+    ),
+    BenchmarkCase(
+        name="search_message_weather",
+        difficulty="hard",
+        prompt="Look up Jake in my contacts, send him a message saying let's meet, and check the weather in Seattle.",
+        tools=(TOOL_SEARCH_CONTACTS, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_ALARM, TOOL_PLAY_MUSIC),
+        expected_calls=[
             {"name": "search_contacts", "arguments": {"query": "Jake"}},
             {"name": "send_message", "arguments": {"recipient": "Jake", "message": "let's meet"}},
             {"name": "get_weather", "arguments": {"location": "Seattle"}},
         ],
-    },
+    ),
 
     # ===== Hard (new domains): 2 tools needed, diverse fields =====
 
     # H11 — Smart home: light + thermostat
-    {
-        "name": "light_and_thermostat",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Turn on the kitchen light and set the thermostat to 72."}],
-        "tools": [TOOL_TURN_ON_LIGHT, TOOL_SET_THERMOSTAT, TOOL_GET_WEATHER, TOOL_SET_ALARM],
-        "expected_calls": [
+    BenchmarkCase(
+        name="light_and_thermostat",
+        difficulty="hard",
+        prompt="Turn on the kitchen light and set the thermostat to 72.",
+        tools=(TOOL_TURN_ON_LIGHT, TOOL_SET_THERMOSTAT, TOOL_GET_WEATHER, TOOL_SET_ALARM),
+        expected_calls=[
             {"name": "turn_on_light", "arguments": {"room": "kitchen"}},
             {"name": "set_thermostat", "arguments": {"temperature": 72}},
         ],
-    },
+    ),
     # H12 — Navigation + food
-    {
-        "name": "directions_and_restaurant",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Find an Italian restaurant and get directions to the airport."}],
-        "tools": [TOOL_FIND_RESTAURANT, TOOL_GET_DIRECTIONS, TOOL_GET_WEATHER, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    BenchmarkCase(
+        name="directions_and_restaurant",
+        difficulty="hard",
+        prompt="Find an Italian restaurant and get directions to the airport.",
+        tools=(TOOL_FIND_RESTAURANT, TOOL_GET_DIRECTIONS, TOOL_GET_WEATHER, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "find_restaurant", "arguments": {"cuisine": "Italian"}},
             {"name": "get_directions", "arguments": {"destination": "airport"}},
         ],
-    },
+    ),
     # H13 — Fitness + music
-    {
-        "name": "workout_and_music",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Log a 30 minute running workout and play workout beats."}],
-        "tools": [TOOL_LOG_WORKOUT, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_GET_WEATHER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="workout_and_music",
+        difficulty="hard",
+        prompt="Log a 30 minute running workout and play workout beats.",
+        tools=(TOOL_LOG_WORKOUT, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_GET_WEATHER),
+        expected_calls=[
             {"name": "log_workout", "arguments": {"activity": "running", "duration": 30}},
             {"name": "play_music", "arguments": {"song": "workout beats"}},
         ],
-    },
+    ),
     # H14 — Calendar + message
-    {
-        "name": "event_and_message",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Create an event called team standup at 9:00 AM and send a message to Mike saying meeting at nine."}],
-        "tools": [TOOL_CREATE_EVENT, TOOL_SEND_MESSAGE, TOOL_SET_ALARM, TOOL_CREATE_REMINDER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="event_and_message",
+        difficulty="hard",
+        prompt="Create an event called team standup at 9:00 AM and send a message to Mike saying meeting at nine.",
+        tools=(TOOL_CREATE_EVENT, TOOL_SEND_MESSAGE, TOOL_SET_ALARM, TOOL_CREATE_REMINDER),
+        expected_calls=[
             {"name": "create_event", "arguments": {"title": "team standup", "time": "9:00 AM"}},
             {"name": "send_message", "arguments": {"recipient": "Mike", "message": "meeting at nine"}},
         ],
-    },
+    ),
     # H15 — Translation + note
-    {
-        "name": "translate_and_note",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Translate hello to Spanish and take a note called greetings with content basic phrases."}],
-        "tools": [TOOL_TRANSLATE_TEXT, TOOL_TAKE_NOTE, TOOL_SEND_MESSAGE, TOOL_READ_NEWS],
-        "expected_calls": [
+    BenchmarkCase(
+        name="translate_and_note",
+        difficulty="hard",
+        prompt="Translate hello to Spanish and take a note called greetings with content basic phrases.",
+        tools=(TOOL_TRANSLATE_TEXT, TOOL_TAKE_NOTE, TOOL_SEND_MESSAGE, TOOL_READ_NEWS),
+        expected_calls=[
             {"name": "translate_text", "arguments": {"text": "hello", "language": "Spanish"}},
             {"name": "take_note", "arguments": {"title": "greetings", "content": "basic phrases"}},
         ],
-    },
+    ),
     # H16 — E-commerce + ride
-    {
-        "name": "cart_and_ride",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Add 2 batteries to the cart and book an economy ride to downtown."}],
-        "tools": [TOOL_ADD_TO_CART, TOOL_BOOK_RIDE, TOOL_GET_DIRECTIONS, TOOL_SET_TIMER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="cart_and_ride",
+        difficulty="hard",
+        prompt="Add 2 batteries to the cart and book an economy ride to downtown.",
+        tools=(TOOL_ADD_TO_CART, TOOL_BOOK_RIDE, TOOL_GET_DIRECTIONS, TOOL_SET_TIMER),
+        expected_calls=[
             {"name": "add_to_cart", "arguments": {"item": "batteries", "quantity": 2}},
             {"name": "book_ride", "arguments": {"destination": "downtown", "ride_type": "economy"}},
         ],
-    },
+    ),
     # H17 — Smart home: volume + lock
-    {
-        "name": "volume_and_lock",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Set the volume to 50 and lock the front door."}],
-        "tools": [TOOL_SET_VOLUME, TOOL_LOCK_DOOR, TOOL_TURN_ON_LIGHT, TOOL_SET_THERMOSTAT],
-        "expected_calls": [
+    BenchmarkCase(
+        name="volume_and_lock",
+        difficulty="hard",
+        prompt="Set the volume to 50 and lock the front door.",
+        tools=(TOOL_SET_VOLUME, TOOL_LOCK_DOOR, TOOL_TURN_ON_LIGHT, TOOL_SET_THERMOSTAT),
+        expected_calls=[
             {"name": "set_volume", "arguments": {"level": 50}},
             {"name": "lock_door", "arguments": {"door": "front door"}},
         ],
-    },
+    ),
     # H18 — News + weather (cross-domain info retrieval)
-    {
-        "name": "news_and_weather",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Read the latest sports news and check the weather in Denver."}],
-        "tools": [TOOL_READ_NEWS, TOOL_GET_WEATHER, TOOL_PLAY_MUSIC, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    BenchmarkCase(
+        name="news_and_weather",
+        difficulty="hard",
+        prompt="Read the latest sports news and check the weather in Denver.",
+        tools=(TOOL_READ_NEWS, TOOL_GET_WEATHER, TOOL_PLAY_MUSIC, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "read_news", "arguments": {"topic": "sports"}},
             {"name": "get_weather", "arguments": {"location": "Denver"}},
         ],
-    },
+    ),
     # H19 — Calendar + timer
-    {
-        "name": "event_and_timer",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Create an event called lunch with Sarah at 12:00 PM and set a timer for 45 minutes."}],
-        "tools": [TOOL_CREATE_EVENT, TOOL_SET_TIMER, TOOL_SET_ALARM, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    BenchmarkCase(
+        name="event_and_timer",
+        difficulty="hard",
+        prompt="Create an event called lunch with Sarah at 12:00 PM and set a timer for 45 minutes.",
+        tools=(TOOL_CREATE_EVENT, TOOL_SET_TIMER, TOOL_SET_ALARM, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "create_event", "arguments": {"title": "lunch with Sarah", "time": "12:00 PM"}},
             {"name": "set_timer", "arguments": {"minutes": 45}},
         ],
-    },
+    ),
     # H20 — Light + music (smart home + media)
-    {
-        "name": "light_and_music",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Turn on the bedroom light and play relaxing piano."}],
-        "tools": [TOOL_TURN_ON_LIGHT, TOOL_PLAY_MUSIC, TOOL_SET_VOLUME, TOOL_LOCK_DOOR],
-        "expected_calls": [
+    BenchmarkCase(
+        name="light_and_music",
+        difficulty="hard",
+        prompt="Turn on the bedroom light and play relaxing piano.",
+        tools=(TOOL_TURN_ON_LIGHT, TOOL_PLAY_MUSIC, TOOL_SET_VOLUME, TOOL_LOCK_DOOR),
+        expected_calls=[
             {"name": "turn_on_light", "arguments": {"room": "bedroom"}},
             {"name": "play_music", "arguments": {"song": "relaxing piano"}},
         ],
-    },
+    ),
     # H21 — Directions + message
-    {
-        "name": "directions_and_message",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Get directions to the hospital and text Anna saying on my way."}],
-        "tools": [TOOL_GET_DIRECTIONS, TOOL_SEND_MESSAGE, TOOL_BOOK_RIDE, TOOL_GET_WEATHER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="directions_and_message",
+        difficulty="hard",
+        prompt="Get directions to the hospital and text Anna saying on my way.",
+        tools=(TOOL_GET_DIRECTIONS, TOOL_SEND_MESSAGE, TOOL_BOOK_RIDE, TOOL_GET_WEATHER),
+        expected_calls=[
             {"name": "get_directions", "arguments": {"destination": "hospital"}},
             {"name": "send_message", "arguments": {"recipient": "Anna", "message": "on my way"}},
         ],
-    },
+    ),
     # H22 — Workout + timer
-    {
-        "name": "workout_and_timer",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Log a 20 minute yoga workout and set a timer for 5 minutes."}],
-        "tools": [TOOL_LOG_WORKOUT, TOOL_SET_TIMER, TOOL_PLAY_MUSIC, TOOL_SET_ALARM],
-        "expected_calls": [
+    BenchmarkCase(
+        name="workout_and_timer",
+        difficulty="hard",
+        prompt="Log a 20 minute yoga workout and set a timer for 5 minutes.",
+        tools=(TOOL_LOG_WORKOUT, TOOL_SET_TIMER, TOOL_PLAY_MUSIC, TOOL_SET_ALARM),
+        expected_calls=[
             {"name": "log_workout", "arguments": {"activity": "yoga", "duration": 20}},
             {"name": "set_timer", "arguments": {"minutes": 5}},
         ],
-    },
+    ),
     # H23 — Ride + message
-    {
-        "name": "ride_and_message",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Book a premium ride to the train station and send a message to Carlos saying arriving soon."}],
-        "tools": [TOOL_BOOK_RIDE, TOOL_SEND_MESSAGE, TOOL_GET_DIRECTIONS, TOOL_CHECK_ORDER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="ride_and_message",
+        difficulty="hard",
+        prompt="Book a premium ride to the train station and send a message to Carlos saying arriving soon.",
+        tools=(TOOL_BOOK_RIDE, TOOL_SEND_MESSAGE, TOOL_GET_DIRECTIONS, TOOL_CHECK_ORDER),
+        expected_calls=[
             {"name": "book_ride", "arguments": {"destination": "train station", "ride_type": "premium"}},
             {"name": "send_message", "arguments": {"recipient": "Carlos", "message": "arriving soon"}},
         ],
-    },
+    ),
     # H24 — Note + alarm
-    {
-        "name": "note_and_alarm",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Take a note called project ideas with content brainstorm session and set an alarm for 7:00 AM."}],
-        "tools": [TOOL_TAKE_NOTE, TOOL_SET_ALARM, TOOL_CREATE_REMINDER, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    BenchmarkCase(
+        name="note_and_alarm",
+        difficulty="hard",
+        prompt="Take a note called project ideas with content brainstorm session and set an alarm for 7:00 AM.",
+        tools=(TOOL_TAKE_NOTE, TOOL_SET_ALARM, TOOL_CREATE_REMINDER, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "take_note", "arguments": {"title": "project ideas", "content": "brainstorm session"}},
             {"name": "set_alarm", "arguments": {"hour": 7, "minute": 0}},
         ],
-    },
+    ),
     # H25 — Thermostat + lock (smart home only)
-    {
-        "name": "thermostat_and_lock",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Set the thermostat to 68 and lock the back door."}],
-        "tools": [TOOL_SET_THERMOSTAT, TOOL_LOCK_DOOR, TOOL_TURN_ON_LIGHT, TOOL_SET_VOLUME],
-        "expected_calls": [
+    BenchmarkCase(
+        name="thermostat_and_lock",
+        difficulty="hard",
+        prompt="Set the thermostat to 68 and lock the back door.",
+        tools=(TOOL_SET_THERMOSTAT, TOOL_LOCK_DOOR, TOOL_TURN_ON_LIGHT, TOOL_SET_VOLUME),
+        expected_calls=[
             {"name": "set_thermostat", "arguments": {"temperature": 68}},
             {"name": "lock_door", "arguments": {"door": "back door"}},
         ],
-    },
+    ),
 
     # ===== SUPERHARD: 3+ tools, complex queries, cross-domain =====
 
     # SH1 — Smart home nighttime routine (3 tools)
-    {
-        "name": "superhard_night_routine",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Turn on the living room light, set the thermostat to 65, and lock the front door."}],
-        "tools": [TOOL_TURN_ON_LIGHT, TOOL_SET_THERMOSTAT, TOOL_LOCK_DOOR, TOOL_SET_VOLUME, TOOL_GET_WEATHER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="superhard_night_routine",
+        difficulty="hard",
+        prompt="Turn on the living room light, set the thermostat to 65, and lock the front door.",
+        tools=(TOOL_TURN_ON_LIGHT, TOOL_SET_THERMOSTAT, TOOL_LOCK_DOOR, TOOL_SET_VOLUME, TOOL_GET_WEATHER),
+        expected_calls=[
             {"name": "turn_on_light", "arguments": {"room": "living room"}},
             {"name": "set_thermostat", "arguments": {"temperature": 65}},
             {"name": "lock_door", "arguments": {"door": "front door"}},
         ],
-    },
+    ),
     # SH2 — Morning cross-domain (3 tools: weather + news + alarm)
-    {
-        "name": "superhard_morning_info",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Check the weather in Boston, read the technology news, and set an alarm for 6:30 AM."}],
-        "tools": [TOOL_GET_WEATHER, TOOL_READ_NEWS, TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_SEND_MESSAGE],
-        "expected_calls": [
+    BenchmarkCase(
+        name="superhard_morning_info",
+        difficulty="hard",
+        prompt="Check the weather in Boston, read the technology news, and set an alarm for 6:30 AM.",
+        tools=(TOOL_GET_WEATHER, TOOL_READ_NEWS, TOOL_SET_ALARM, TOOL_PLAY_MUSIC, TOOL_SEND_MESSAGE),
+        expected_calls=[
             {"name": "get_weather", "arguments": {"location": "Boston"}},
             {"name": "read_news", "arguments": {"topic": "technology"}},
             {"name": "set_alarm", "arguments": {"hour": 6, "minute": 30}},
         ],
-    },
+    ),
     # SH3 — Travel prep (3 tools: ride + directions + message)
-    {
-        "name": "superhard_travel_prep",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Book a premium ride to the airport, get directions to the airport, and text Rachel saying leaving now."}],
-        "tools": [TOOL_BOOK_RIDE, TOOL_GET_DIRECTIONS, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_TIMER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="superhard_travel_prep",
+        difficulty="hard",
+        prompt="Book a premium ride to the airport, get directions to the airport, and text Rachel saying leaving now.",
+        tools=(TOOL_BOOK_RIDE, TOOL_GET_DIRECTIONS, TOOL_SEND_MESSAGE, TOOL_GET_WEATHER, TOOL_SET_TIMER),
+        expected_calls=[
             {"name": "book_ride", "arguments": {"destination": "airport", "ride_type": "premium"}},
             {"name": "get_directions", "arguments": {"destination": "airport"}},
             {"name": "send_message", "arguments": {"recipient": "Rachel", "message": "leaving now"}},
         ],
-    },
+    ),
     # SH4 — Evening entertainment (3 tools: light + volume + music)
-    {
-        "name": "superhard_entertainment",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Turn on the living room light, set the volume to 80, and play ambient chill."}],
-        "tools": [TOOL_TURN_ON_LIGHT, TOOL_SET_VOLUME, TOOL_PLAY_MUSIC, TOOL_LOCK_DOOR, TOOL_SET_THERMOSTAT],
-        "expected_calls": [
+    BenchmarkCase(
+        name="superhard_entertainment",
+        difficulty="hard",
+        prompt="Turn on the living room light, set the volume to 80, and play ambient chill.",
+        tools=(TOOL_TURN_ON_LIGHT, TOOL_SET_VOLUME, TOOL_PLAY_MUSIC, TOOL_LOCK_DOOR, TOOL_SET_THERMOSTAT),
+        expected_calls=[
             {"name": "turn_on_light", "arguments": {"room": "living room"}},
             {"name": "set_volume", "arguments": {"level": 80}},
             {"name": "play_music", "arguments": {"song": "ambient chill"}},
         ],
-    },
+    ),
     # SH5 — Full cross-domain (3 tools: workout + music + timer)
-    {
-        "name": "superhard_gym_session",
-        "difficulty": "hard",
-        "messages": [{"role": "user", "content": "Log a 45 minute cycling workout, play upbeat electronic, and set a timer for 10 minutes."}],
-        "tools": [TOOL_LOG_WORKOUT, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_SET_ALARM, TOOL_GET_WEATHER],
-        "expected_calls": [
+    BenchmarkCase(
+        name="superhard_gym_session",
+        difficulty="hard",
+        prompt="Log a 45 minute cycling workout, play upbeat electronic, and set a timer for 10 minutes.",
+        tools=(TOOL_LOG_WORKOUT, TOOL_PLAY_MUSIC, TOOL_SET_TIMER, TOOL_SET_ALARM, TOOL_GET_WEATHER),
+        expected_calls=[
             {"name": "log_workout", "arguments": {"activity": "cycling", "duration": 45}},
             {"name": "play_music", "arguments": {"song": "upbeat electronic"}},
             {"name": "set_timer", "arguments": {"minutes": 10}},
         ],
-    },
-]
+    ),
+)
 
+# Column views over BENCHMARKS for filtering without touching every case dict
+BENCH_NAMES = tuple(b.name for b in BENCHMARKS)
+BENCH_DIFFICULTIES = tuple(b.difficulty for b in BENCHMARKS)
+# Tool sets packed into one int per case, one bit per entry of _ALL_TOOLS
+BENCH_TOOL_MASKS = tuple(sum(_TOOL_BIT[t["name"]] for t in b.tools) for b in BENCHMARKS)
+
+
+def filter_by_difficulty(*difficulties):
+    """Return the benchmark cases whose difficulty is one of `difficulties`."""
+    wanted = set(difficulties)
+    return [BENCHMARKS[i] for i, d in enumerate(BENCH_DIFFICULTIES) if d in wanted]
 
-def _normalize(v):
-    """Normalize a value for comparison."""
-    if isinstance(v, str):
-        return v.strip().lower()
-    return v
 
+def filter_by_tool(*tool_names):
+    """Return the benchmark cases whose tool list includes every name in `tool_names`."""
+    wanted = sum(_TOOL_BIT[n] for n in tool_names)
+    return [BENCHMARKS[i] for i, m in enumerate(BENCH_TOOL_MASKS) if m & wanted == wanted]
+
+
+def _max_matching(remaining, unused):
+    """
+    Size of a maximum one-to-one matching between compiled expected calls and
+    predicted calls (augmenting paths), so a prediction that fits several
+    expected calls is not spent on the wrong one.
+    """
+    edges = [[i for i, pred in enumerate(unused) if _matches_compiled(pred, name, arg_items)]
+             for name, arg_items in remaining]
+    owner = {}
 
-def _call_matches(predicted, expected):
-    """Check if a predicted call matches an expected call (name + argument values)."""
-    if predicted["name"] != expected["name"]:
+    def assign(j, seen):
+        for i in edges[j]:
+            if i not in seen:
+                seen.add(i)
+                if i not in owner or assign(owner[i], seen):
+                    owner[i] = j
+                    return True
         return False
-    pred_args = predicted.get("arguments", {})
-    exp_args = expected.get("arguments", {})
-    for key, exp_val in exp_args.items():
-        if key not in pred_args:
-            return False
-        if _normalize(pred_args[key]) != _normalize(exp_val):
-            return False
-    return True
+
+    return sum(assign(j, set()) for j in range(len(edges)))
 
 
-def compute_f1(predicted_calls, expected_calls):
+def compute_f1(predicted_calls, expected_calls, compiled=None):
     """Compute F1 score between predicted and expected function calls."""
     if not predicted_calls and not expected_calls:
         return 1.0
     if not predicted_calls or not expected_calls:
         return 0.0
+    if compiled is None:
+        compiled = _compile_expected(expected_calls)
 
-    matched = 0
-    used = set()
-    for exp in expected_calls:
-        for i, pred in enumerate(predicted_calls):
-            if i not in used and _call_matches(pred, exp):
-                matched += 1
-                used.add(i)
-                break
+    # Exact matches are a multiset intersection of fingerprints
+    fps = [_fingerprint(pred) for pred in predicted_calls]
+    pred_fps = Counter(fps)
+    exact = pred_fps & Counter(fp for fp, _, _ in compiled)
+    matched = sum(exact.values())
+
+    # Predictions with extra arguments still need a field-by-field check;
+    # taking exact matches first never shrinks the maximum matching
+    unmatched_exp = exact.copy()
+    remaining = []
+    for fp, name, arg_items in compiled:
+        if unmatched_exp[fp]:
+            unmatched_exp[fp] -= 1
+        else:
+            remaining.append((name, arg_items))
+    leftover = pred_fps - exact
+    unused = []
+    for fp, pred in zip(fps, predicted_calls):
+        if leftover[fp]:
+            leftover[fp] -= 1
+            unused.append(pred)
+    if remaining and unused:
+        matched += _max_matching(remaining, unused)
 
     precision = matched / len(predicted_calls)
     recall = matched / len(expected_calls)
@@ -816,64 +855,203 @@ def compute_f1(predicted_calls, expected_calls):
     return 2 * precision * recall / (precision + recall)
 
 
-def run_benchmark(benchmarks=None):
-    """Run all benchmark cases and print results."""
-    if benchmarks is None:
-        benchmarks = BENCHMARKS
+# Results of earlier runs, keyed by a digest of (main.py source, messages, tools)
+RESULT_CACHE_PATH = ".bench_cache.json"
+_result_cache = None
+
+
+@functools.cache
+def _main_version():
+    """Digest of main.py, so editing the router invalidates cached results."""
+    with open(_import_main().__file__, "rb") as f:
+        return blake2b(f.read(), digest_size=16).hexdigest()
+
 
+def _result_key(case):
+    payload = _canonical_json([_main_version(), case.messages, [dict(t) for t in case.tools]])
+    return blake2b(payload, digest_size=16).hexdigest()
+
+
+def _load_result_cache():
+    global _result_cache
+    if _result_cache is None:
+        try:
+            with open(RESULT_CACHE_PATH) as f:
+                _result_cache = json.load(f)
+        except (OSError, ValueError):
+            _result_cache = {}
+    return _result_cache
+
+
+def _save_result_cache():
+    if _result_cache is not None:
+        with open(RESULT_CACHE_PATH, "w") as f:
+            json.dump(_result_cache, f)
+
+
+def _run_case(case, reuse_results=False, generate=None):
+    """Run one case through generate_hybrid (or `generate`), optionally reusing an earlier result."""
+    if generate is not None:
+        return generate(case.messages, list(case.tools))
+    generate_hybrid = _get_generate()
+    if not reuse_results:
+        return generate_hybrid(case.messages, list(case.tools))
+    cache = _load_result_cache()
+    key = _result_key(case)
+    if key not in cache:
+        cache[key] = generate_hybrid(case.messages, list(case.tools))
+    return cache[key]
+
+
+async def _run_cases(benchmarks, order, max_parallel, reuse_results, generate=None, label=""):
+    """Run cases in worker threads, at most max_parallel at a time, in `order`."""
+    semaphore = asyncio.Semaphore(max_parallel)
     total = len(benchmarks)
-    results = []
-    for i, case in enumerate(benchmarks, 1):
-        print(f"[{i}/{total}] Running: {case['name']} ({case['difficulty']})...", end=" ", flush=True)
-        result = generate_hybrid(case["messages"], case["tools"])
-        f1 = compute_f1(result["function_calls"], case["expected_calls"])
+    results = [None] * total
+    done = 0
+
+    async def run_one(j):
+        nonlocal done
+        case = benchmarks[j]
+        async with semaphore:
+            result = await asyncio.to_thread(_run_case, case, reuse_results, generate)
+        f1 = compute_f1(result["function_calls"], case.expected_calls, case.expected_compiled)
         source = result.get("source", "unknown")
-        print(f"F1={f1:.2f} | {result['total_time_ms']:.0f}ms | {source}")
-        results.append({
-            "name": case["name"],
-            "difficulty": case["difficulty"],
+        done += 1
+        print(f"{label}[{done}/{total}] {case.name} ({case.difficulty}): F1={f1:.2f} | {result['total_time_ms']:.0f}ms | {source}", flush=True)
+        results[j] = {
+            "name": case.name,
+            "difficulty": case.difficulty,
             "total_time_ms": result["total_time_ms"],
             "f1": f1,
             "source": source,
             "predicted": result["function_calls"],
-            "expected": case["expected_calls"],
-        })
+            "expected": [{"name": c["name"], "arguments": dict(c["arguments"])} for c in case.expected_calls],
+        }
 
-    print("\n=== Benchmark Results ===\n")
-    print(f"  {'#':>2} | {'Difficulty':<10} | {'Name':<28} | {'Time (ms)':>10} | {'F1':>5} | Source")
-    print(f"  {'--':>2}-+-{'-'*10}-+-{'-'*28}-+-{'-'*10}-+-{'-'*5}-+-{'-'*20}")
-    for i, r in enumerate(results, 1):
-        print(f"  {i:>2} | {r['difficulty']:<10} | {r['name']:<28} | {r['total_time_ms']:>10.2f} | {r['f1']:>5.2f} | {r['source']}")
+    await asyncio.gather(*(run_one(j) for j in order))
+    return results
+
+
+def run_benchmark(benchmarks=None, group_by_tools=True, reuse_results=False, max_parallel=1, warmup=1):
+    """
+    Run all benchmark cases and print results.
+    With group_by_tools, cases sharing a tool set run back-to-back so the
+    model-side tool caches stay warm; results keep the original case order.
+    With reuse_results, a case whose result is in RESULT_CACHE_PATH for the
+    current main.py is not re-run.
+    Cases run one at a time by default, so each total_time_ms measures only
+    that case. max_parallel > 1 overlaps cloud calls with on-device inference
+    for quicker F1 checks, but then reported times include queueing behind
+    other cases (main serializes on its single model handle).
+    With warmup, the model is loaded and each distinct tool set's caches are
+    built beforehand, untimed, so that setup doesn't land in the first
+    measured result (many cases never reach the model at all).
+    """
+    benchmarks = BENCHMARKS if benchmarks is None else [_as_case(c) for c in benchmarks]
 
-    print(f"\n--- Summary ---")
+    if warmup > 0 and benchmarks:
+        warm_up = _import_main().warm_up
+        start = time.perf_counter_ns()
+        for tools in {case.tools_signature: case.tools for case in benchmarks}.values():
+            warm_up(list(tools))
+        print(f"Warmup complete in {(time.perf_counter_ns() - start) / 1e6:.0f}ms", flush=True)
+
+    order = range(len(benchmarks))
+    if group_by_tools:
+        order = sorted(order, key=lambda j: benchmarks[j].tools_signature)
+    results = asyncio.run(_run_cases(benchmarks, order, max_parallel, reuse_results))
+    if reuse_results:
+        _save_result_cache()
+
+    out = ["\n=== Benchmark Results ===\n"]
+    out.append(f"  {'#':>2} | {'Difficulty':<10} | {'Name':<28} | {'Time (ms)':>10} | {'F1':>5} | Source")
+    out.append(f"  {'--':>2}-+-{'-'*10}-+-{'-'*28}-+-{'-'*10}-+-{'-'*5}-+-{'-'*20}")
+    out.extend(
+        f"  {i:>2} | {r['difficulty']:<10} | {r['name']:<28} | {r['total_time_ms']:>10.2f} | {r['f1']:>5.2f} | {r['source']}"
+        for i, r in enumerate(results, 1)
+    )
+
+    out.append(f"\n--- Summary ---")
+    groups = aggregate_results(results)
     for difficulty in ["easy", "medium", "hard"]:
-        group = [r for r in results if r["difficulty"] == difficulty]
-        if not group:
+        g = groups.get(difficulty)
+        if not g:
             continue
-        avg_f1 = sum(r["f1"] for r in group) / len(group)
-        avg_time = sum(r["total_time_ms"] for r in group) / len(group)
-        on_device = sum(1 for r in group if r["source"] == "on-device")
-        cloud = len(group) - on_device
-        print(f"  {difficulty:<8} avg F1={avg_f1:.2f}  avg time={avg_time:.2f}ms  on-device={on_device}/{len(group)} cloud={cloud}/{len(group)}")
-
-    avg_f1 = sum(r["f1"] for r in results) / len(results)
-    avg_time = sum(r["total_time_ms"] for r in results) / len(results)
-    total_time = sum(r["total_time_ms"] for r in results)
-    on_device_total = sum(1 for r in results if r["source"] == "on-device")
-    cloud_total = len(results) - on_device_total
-    print(f"  {'overall':<8} avg F1={avg_f1:.2f}  avg time={avg_time:.2f}ms  total time={total_time:.2f}ms")
-    print(f"           on-device={on_device_total}/{len(results)} ({100*on_device_total/len(results):.0f}%)  cloud={cloud_total}/{len(results)} ({100*cloud_total/len(results):.0f}%)")
+        n = g["n"]
+        out.append(f"  {difficulty:<8} avg F1={g['f1'] / n:.2f}  avg time={g['time_ms'] / n:.2f}ms  on-device={g['on_device']}/{n} cloud={n - g['on_device']}/{n}")
+
+    n = len(results)
+    f1_total = sum(g["f1"] for g in groups.values())
+    total_time = sum(g["time_ms"] for g in groups.values())
+    on_device_total = sum(g["on_device"] for g in groups.values())
+    cloud_total = n - on_device_total
+    out.append(f"  {'overall':<8} avg F1={f1_total / n:.2f}  avg time={total_time / n:.2f}ms  total time={total_time:.2f}ms")
+    out.append(f"           on-device={on_device_total}/{n} ({100*on_device_total/n:.0f}%)  cloud={cloud_total}/{n} ({100*cloud_total/n:.0f}%)")
 
     # Total score
-    score = compute_total_score(results)
-    print(f"\n{'='*50}")
-    print(f"  TOTAL SCORE: {score:.1f}%")
-    print(f"{'='*50}")
+    score = compute_total_score(results, groups)
+    out.append(f"\n{'='*50}")
+    out.append(f"  TOTAL SCORE: {score:.1f}%")
+    out.append(f"{'='*50}")
+
+    # Progress lines stream as cases finish; the report goes out in one write
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
     return results
 
 
-def compute_total_score(results):
+def aggregate_results(results):
+    """Per-difficulty sums of F1, time and on-device count, in one pass over results."""
+    groups = defaultdict(lambda: {"f1": 0.0, "time_ms": 0.0, "on_device": 0, "n": 0})
+    for r in results:
+        g = groups[r["difficulty"]]
+        g["f1"] += r["f1"]
+        g["time_ms"] += r["total_time_ms"]
+        g["on_device"] += r["source"] == "on-device"
+        g["n"] += 1
+    return dict(groups)
+
+
+async def _run_backends(backends, benchmarks, max_parallel, max_parallel_models):
+    semaphore = asyncio.Semaphore(max_parallel_models)
+    order = sorted(range(len(benchmarks)), key=lambda j: benchmarks[j].tools_signature)
+
+    async def run_one(name, generate):
+        async with semaphore:
+            return await _run_cases(benchmarks, order, max_parallel, False, generate, label=f"{name} ")
+
+    names = list(backends)
+    runs = await asyncio.gather(*(run_one(n, backends[n]) for n in names))
+    return dict(zip(names, runs))
+
+
+def compare_backends(backends, benchmarks=None, max_parallel=1, max_parallel_models=1):
+    """
+    Run the benchmark against several generate(messages, tools) callables,
+    e.g. {"hybrid": generate_hybrid, "cloud": generate_cloud}, and print each
+    one's score. Cases and backends run one at a time by default so times
+    are uncontended; raising max_parallel / max_parallel_models runs them
+    concurrently at the cost of times that include queueing.
+    Returns {name: results}.
+    """
+    benchmarks = BENCHMARKS if benchmarks is None else [_as_case(c) for c in benchmarks]
+
+    runs = asyncio.run(_run_backends(backends, benchmarks, max_parallel, max(1, max_parallel_models)))
+
+    print("\n=== Backend Comparison ===\n")
+    for name, results in runs.items():
+        groups = aggregate_results(results)
+        n = len(results)
+        avg_f1 = sum(g["f1"] for g in groups.values()) / n
+        avg_time = sum(g["time_ms"] for g in groups.values()) / n
+        print(f"  {name:<12} score={compute_total_score(results, groups):5.1f}%  avg F1={avg_f1:.2f}  avg time={avg_time:.2f}ms")
+
+    return runs
+
+
+def compute_total_score(results, groups=None):
     """
     Compute a total score from 0-100% as a weighted sum across difficulty levels.
 
@@ -882,6 +1060,8 @@ def compute_total_score(results):
       - Time score (25%): faster is better, capped at 500ms baseline
       - On-device ratio (25%): higher on-device usage is better
 
+    `groups` is the output of aggregate_results(results), if already computed.
+
     Difficulty weights:
       - easy: 20%
       - medium: 30%
@@ -890,15 +1070,18 @@ def compute_total_score(results):
     difficulty_weights = {"easy": 0.20, "medium": 0.30, "hard": 0.50}
     time_baseline_ms = 500  # anything under this gets full marks
 
+    if groups is None:
+        groups = aggregate_results(results)
+
     total_score = 0
     for difficulty, weight in difficulty_weights.items():
-        group = [r for r in results if r["difficulty"] == difficulty]
-        if not group:
+        g = groups.get(difficulty)
+        if not g:
             continue
 
-        avg_f1 = sum(r["f1"] for r in group) / len(group)
-        avg_time = sum(r["total_time_ms"] for r in group) / len(group)
-        on_device_ratio = sum(1 for r in group if r["source"] == "on-device") / len(group)
+        avg_f1 = g["f1"] / g["n"]
+        avg_time = g["time_ms"] / g["n"]
+        on_device_ratio = g["on_device"] / g["n"]
 
         time_score = max(0, 1 - avg_time / time_baseline_ms)
 
@@ -909,4 +1092,26 @@ def compute_total_score(results):
 
 
 if __name__ == "__main__":
-    run_benchmark()
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the hybrid function-calling benchmark")
+    parser.add_argument("--max-parallel", type=int, default=1,
+                        help="Cases in flight at once; >1 is faster but reported times include queueing")
+    parser.add_argument("--warmup", type=int, default=1, help="Load the model and build tool caches before measuring (0 to skip)")
+    parser.add_argument("--cache", action="store_true",
+                        help=f"Replay results stored in {RESULT_CACHE_PATH} instead of re-running those cases (scores are then not fresh measurements)")
+    parser.add_argument("--difficulty", action="append", choices=["easy", "medium", "hard"], help="Only run this tier (repeatable)")
+    parser.add_argument("--case", action="append", metavar="NAME", help="Only run the named case (repeatable)")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the selection N times")
+    args = parser.parse_args()
+
+    benchmarks = filter_by_difficulty(*args.difficulty) if args.difficulty else list(BENCHMARKS)
+    if args.case:
+        unknown = set(args.case) - set(BENCH_NAMES)
+        if unknown:
+            parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+        benchmarks = [b for b in benchmarks if b.name in args.case]
+    if not benchmarks:
+        parser.error("no benchmark cases match the given filters")
+
+    for _ in range(args.repeat):
+        run_benchmark(benchmarks, max_parallel=args.max_parallel, reuse_results=args.cache, warmup=args.warmup)
@@ -3,30 +3,90 @@ FieldKey Voice-First Locksmith Assistant — FastAPI Backend
 Wraps main.py hybrid routing + Cactus Whisper transcription
 """
 
-import sys, os, json, time, tempfile, uuid, re as _re, asyncio, concurrent.futures, subprocess, threading
+import sys, os, json, time, tempfile, shutil, secrets, hashlib, queue, wave, re as _re, asyncio, concurrent.futures
+from collections import OrderedDict, defaultdict, deque
 sys.path.insert(0, "cactus/python/src")
 
 from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional
-
-from main import generate_hybrid
+from typing import Callable, Optional
+
+from main import generate_hybrid, warm_up
+
+# Optional: faster JSON for transcription output and API responses. Endpoints
+# with large or nested bodies return _JSONResponse themselves, which also skips
+# FastAPI's jsonable_encoder walk over plain dicts and lists.
+try:
+    import orjson
+
+    class _JSONResponse(JSONResponse):
+        def render(self, content) -> bytes:
+            return orjson.dumps(content)
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _JSONResponse = JSONResponse
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# Optional: in-process decode + resample (libsndfile can't read m4a/aac; those still use ffmpeg)
+try:
+    import soundfile, soxr
+except ImportError:
+    soundfile = soxr = None
 from cactus import cactus_init, cactus_transcribe, cactus_reset
 
 # ══════════════════════════════════════════════════════════════════════
 # WHISPER MODEL
 # ══════════════════════════════════════════════════════════════════════
 
-WHISPER_MODEL_PATH = "cactus/weights/whisper-small"
+# Override to serve a different conversion, e.g. INT8-quantized weights
+WHISPER_MODEL_PATH = os.environ.get("WHISPER_MODEL_PATH", "cactus/weights/whisper-small")
 _whisper_model = None
 
+# A cactus handle decodes one clip at a time, so concurrency comes from
+# holding several handles; each costs a full copy of the model in memory.
+# All of them are loaded up front with the first, never on the request path.
+# Defaults to a single handle; extra copies are opt-in.
+WHISPER_WORKERS = max(1, int(os.environ.get("WHISPER_WORKERS", "1")))
+# Handles not currently decoding
+_whisper_idle: queue.SimpleQueue = queue.SimpleQueue()
+_whisper_pool_size = 0
+
+# (path, time checked, exists) — health checks and lazy loads re-stat at most every 5s
+_WHISPER_PATH_TTL = 5.0
+_whisper_path_check = (None, 0.0, False)
+
+def _whisper_available():
+    global _whisper_path_check
+    path, checked_at, exists = _whisper_path_check
+    now = time.monotonic()
+    if path != WHISPER_MODEL_PATH or now - checked_at > _WHISPER_PATH_TTL:
+        exists = os.path.exists(WHISPER_MODEL_PATH)
+        _whisper_path_check = (WHISPER_MODEL_PATH, now, exists)
+    return exists
+
 def _get_whisper():
-    global _whisper_model
+    global _whisper_model, _whisper_pool_size
     if _whisper_model is None:
-        if os.path.exists(WHISPER_MODEL_PATH):
-            _whisper_model = cactus_init(WHISPER_MODEL_PATH)
+        if _whisper_available():
+            model = cactus_init(WHISPER_MODEL_PATH)
+            _whisper_idle.put(model)
+            _whisper_pool_size = 1
+            for _ in range(WHISPER_WORKERS - 1):
+                try:
+                    _whisper_idle.put(cactus_init(WHISPER_MODEL_PATH))
+                    _whisper_pool_size += 1
+                except Exception as e:
+                    # Fewer handles just means fewer concurrent decodes
+                    print(f"[WARN] Extra Whisper handle failed to load: {e}")
+                    break
+            _whisper_model = model
         else:
             print(f"[WARN] Whisper model not found at {WHISPER_MODEL_PATH}")
     return _whisper_model
@@ -132,134 +192,175 @@ LOCKSMITH_TOOLS = [
 # MOCK TOOL EXECUTION
 # ══════════════════════════════════════════════════════════════════════
 
-def execute_tool(name: str, arguments: dict) -> dict:
-    """Execute a locksmith tool with mock results for demo purposes."""
+_CHECKLISTS = {
+    "residential rekey": [
+        "Verify customer ID and ownership/authorization",
+        "Count total locks to be rekeyed",
+        "Check existing keyway (SC1, KW1, etc.)",
+        "Prepare pinning kit with correct depths",
+        "Test all locks before and after rekey",
+        "Provide new keys and test each one",
+        "Document key bitting for records",
+    ],
+    "commercial install": [
+        "Review building codes and fire marshal requirements",
+        "Verify door prep dimensions",
+        "Check for ADA compliance requirements",
+        "Confirm master key system compatibility",
+        "Install hardware per manufacturer specs",
+        "Test panic hardware and auto-closers",
+        "Provide documentation to building manager",
+    ],
+    "auto lockout": [
+        "Verify vehicle ownership (registration/ID)",
+        "Identify vehicle make, model, and year",
+        "Select appropriate entry tool",
+        "Protect paint and weather stripping",
+        "Attempt non-destructive entry first",
+        "Test all doors after entry",
+        "Document any pre-existing damage",
+    ],
+}
 
-    if name == "diagnose_lock_fault":
-        location = arguments.get("location", "door")
-        symptoms = arguments.get("symptoms", "issue")
-        lock_type = arguments.get("lock_type", "deadbolt")
-        return {
-            "diagnosis": f"Likely worn tailpiece or misaligned strike plate",
-            "location": location,
-            "symptoms_confirmed": symptoms,
-            "lock_type": lock_type,
-            "recommended_action": "Remove cylinder, inspect tailpiece for wear. Check strike plate alignment with 1/8\" tolerance.",
-            "estimated_time": "25-35 minutes",
-            "parts_needed": ["Replacement tailpiece", "Strike plate shims"],
-            "difficulty": "moderate",
-        }
+_DEFAULT_CHECKLIST = [
+    "Verify job scope with customer",
+    "Inspect existing hardware",
+    "Prepare tools and parts",
+    "Perform service",
+    "Test and verify completion",
+    "Clean work area",
+    "Collect payment and provide receipt",
+]
 
-    elif name == "log_service_report":
-        return {
-            "status": "logged",
-            "report_id": f"SR-{uuid.uuid4().hex[:8].upper()}",
-            "customer": arguments.get("customer_name", ""),
-            "service": arguments.get("service_type", ""),
-            "timestamp": time.strftime("%Y-%m-%d %H:%M"),
-            "notes": arguments.get("notes", "No additional notes"),
-        }
 
-    elif name == "generate_checklist":
-        job_type = arguments.get("job_type", "general").lower()
-        checklists = {
-            "residential rekey": [
-                "Verify customer ID and ownership/authorization",
-                "Count total locks to be rekeyed",
-                "Check existing keyway (SC1, KW1, etc.)",
-                "Prepare pinning kit with correct depths",
-                "Test all locks before and after rekey",
-                "Provide new keys and test each one",
-                "Document key bitting for records",
-            ],
-            "commercial install": [
-                "Review building codes and fire marshal requirements",
-                "Verify door prep dimensions",
-                "Check for ADA compliance requirements",
-                "Confirm master key system compatibility",
-                "Install hardware per manufacturer specs",
-                "Test panic hardware and auto-closers",
-                "Provide documentation to building manager",
-            ],
-            "auto lockout": [
-                "Verify vehicle ownership (registration/ID)",
-                "Identify vehicle make, model, and year",
-                "Select appropriate entry tool",
-                "Protect paint and weather stripping",
-                "Attempt non-destructive entry first",
-                "Test all doors after entry",
-                "Document any pre-existing damage",
-            ],
-        }
-        items = checklists.get(job_type, [
-            "Verify job scope with customer",
-            "Inspect existing hardware",
-            "Prepare tools and parts",
-            "Perform service",
-            "Test and verify completion",
-            "Clean work area",
-            "Collect payment and provide receipt",
-        ])
-        return {"job_type": job_type, "checklist": items}
-
-    elif name == "lookup_part":
-        query = arguments.get("query", "")
-        brand = arguments.get("brand", "Generic")
-        return {
-            "part": query,
-            "brand": brand,
-            "found": True,
-            "description": f"{brand} {query}",
-            "price_range": "$4.50 - $12.00",
-            "in_stock": True,
-            "compatible_models": ["B60N", "B62N", "B560P"],
-            "supplier": "Lock Supply Co.",
-            "notes": "Standard 6-pin key blank, available in brass and nickel silver",
-        }
+def _new_id(prefix: str, nbytes: int) -> str:
+    """Short random reference like SR-1A2B3C4D (2 hex chars per byte)."""
+    return f"{prefix}-{secrets.token_hex(nbytes).upper()}"
 
-    elif name == "schedule_followup":
-        return {
-            "status": "scheduled",
-            "appointment_id": f"APT-{uuid.uuid4().hex[:6].upper()}",
-            "customer": arguments.get("customer_name", ""),
-            "date": arguments.get("date", ""),
-            "reason": arguments.get("reason", "Follow-up service"),
-            "confirmation": "Customer will receive SMS confirmation",
-        }
 
-    elif name == "contact_dispatch":
-        urgency = arguments.get("urgency", "medium")
-        return {
-            "status": "dispatched",
-            "dispatch_id": f"DSP-{uuid.uuid4().hex[:6].upper()}",
-            "reason": arguments.get("reason", ""),
-            "urgency": urgency,
-            "eta": "10-15 minutes" if urgency in ("high", "emergency") else "20-30 minutes",
-            "dispatcher": "Central Dispatch",
-            "confirmation": "Dispatch notified and backup en route",
-        }
+def _diagnose_lock_fault(arguments: dict) -> dict:
+    location = arguments.get("location", "door")
+    symptoms = arguments.get("symptoms", "issue")
+    lock_type = arguments.get("lock_type", "deadbolt")
+    return {
+        "diagnosis": f"Likely worn tailpiece or misaligned strike plate",
+        "location": location,
+        "symptoms_confirmed": symptoms,
+        "lock_type": lock_type,
+        "recommended_action": "Remove cylinder, inspect tailpiece for wear. Check strike plate alignment with 1/8\" tolerance.",
+        "estimated_time": "25-35 minutes",
+        "parts_needed": ["Replacement tailpiece", "Strike plate shims"],
+        "difficulty": "moderate",
+    }
 
-    elif name == "generate_invoice":
-        invoice_id = f"INV-{uuid.uuid4().hex[:6].upper()}"
-        customer = arguments.get("customer_name", "Customer")
-        service = arguments.get("service_type", "Locksmith Service")
-        amount = arguments.get("amount", "$150.00")
-        notes = arguments.get("notes", "")
 
-        # Generate actual PDF
-        pdf_path = _generate_invoice_pdf(invoice_id, customer, service, amount, notes)
+def _log_service_report(arguments: dict) -> dict:
+    return {
+        "status": "logged",
+        "report_id": _new_id("SR", 4),
+        "customer": arguments.get("customer_name", ""),
+        "service": arguments.get("service_type", ""),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M"),
+        "notes": arguments.get("notes", "No additional notes"),
+    }
+
+
+def _generate_checklist(arguments: dict) -> dict:
+    job_type = arguments.get("job_type", "general").lower()
+    items = _CHECKLISTS.get(job_type, _DEFAULT_CHECKLIST)
+    return {"job_type": job_type, "checklist": list(items)}
+
+
+def _lookup_part(arguments: dict) -> dict:
+    query = arguments.get("query", "")
+    brand = arguments.get("brand", "Generic")
+    return {
+        "part": query,
+        "brand": brand,
+        "found": True,
+        "description": f"{brand} {query}",
+        "price_range": "$4.50 - $12.00",
+        "in_stock": True,
+        "compatible_models": ["B60N", "B62N", "B560P"],
+        "supplier": "Lock Supply Co.",
+        "notes": "Standard 6-pin key blank, available in brass and nickel silver",
+    }
+
+
+def _schedule_followup(arguments: dict) -> dict:
+    return {
+        "status": "scheduled",
+        "appointment_id": _new_id("APT", 3),
+        "customer": arguments.get("customer_name", ""),
+        "date": arguments.get("date", ""),
+        "reason": arguments.get("reason", "Follow-up service"),
+        "confirmation": "Customer will receive SMS confirmation",
+    }
+
+
+def _contact_dispatch(arguments: dict) -> dict:
+    urgency = arguments.get("urgency", "medium")
+    return {
+        "status": "dispatched",
+        "dispatch_id": _new_id("DSP", 3),
+        "reason": arguments.get("reason", ""),
+        "urgency": urgency,
+        "eta": "10-15 minutes" if urgency in ("high", "emergency") else "20-30 minutes",
+        "dispatcher": "Central Dispatch",
+        "confirmation": "Dispatch notified and backup en route",
+    }
+
+
+# Invoice PDFs still being rendered, by invoice id
+_pending_invoices: dict[str, concurrent.futures.Future] = {}
+
+
+def _finish_invoice(invoice_id: str, future: concurrent.futures.Future):
+    _pending_invoices.pop(invoice_id, None)
+    if future.exception() is not None:
+        print(f"[WARN] Invoice PDF {invoice_id} failed: {future.exception()}", flush=True)
 
-        return {
-            "status": "generated",
-            "invoice_id": invoice_id,
-            "customer": customer,
-            "service": service,
-            "amount": amount,
-            "pdf_url": f"/api/invoice/{invoice_id}",
-            "timestamp": time.strftime("%Y-%m-%d %H:%M"),
-        }
 
-    return {"error": f"Unknown tool: {name}"}
+def _generate_invoice(arguments: dict) -> dict:
+    invoice_id = _new_id("INV", 3)
+    customer = arguments.get("customer_name", "Customer")
+    service = arguments.get("service_type", "Locksmith Service")
+    amount = arguments.get("amount", "$150.00")
+    notes = arguments.get("notes", "")
+
+    # Render the PDF in the background; /api/invoice waits for it if fetched early
+    future = _io_exec.submit(_generate_invoice_pdf, invoice_id, customer, service, amount, notes)
+    _pending_invoices[invoice_id] = future
+    future.add_done_callback(lambda f: _finish_invoice(invoice_id, f))
+
+    return {
+        "status": "generated",
+        "invoice_id": invoice_id,
+        "customer": customer,
+        "service": service,
+        "amount": amount,
+        "pdf_url": f"/api/invoice/{invoice_id}",
+        "timestamp": time.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+_TOOL_HANDLERS: dict[str, Callable[[dict], dict]] = {
+    "diagnose_lock_fault": _diagnose_lock_fault,
+    "log_service_report": _log_service_report,
+    "generate_checklist": _generate_checklist,
+    "lookup_part": _lookup_part,
+    "schedule_followup": _schedule_followup,
+    "contact_dispatch": _contact_dispatch,
+    "generate_invoice": _generate_invoice,
+}
+
+
+def execute_tool(name: str, arguments: dict) -> dict:
+    """Execute a locksmith tool with mock results for demo purposes."""
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return {"error": f"Unknown tool: {name}"}
+    return handler(arguments)
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -272,7 +373,7 @@ os.makedirs(INVOICE_DIR, exist_ok=True)
 
 def _generate_invoice_pdf(invoice_id, customer, service, amount, notes=""):
     """Generate a professional locksmith invoice PDF."""
-    from fpdf import FPDF
+    from fpdf import FPDF, XPos, YPos
 
     pdf = FPDF()
     pdf.add_page()
@@ -284,11 +385,11 @@ def _generate_invoice_pdf(invoice_id, customer, service, amount, notes=""):
     pdf.set_text_color(255, 107, 53)
     pdf.set_font("Helvetica", "B", 24)
     pdf.set_xy(15, 10)
-    pdf.cell(0, 12, "FieldKey", ln=True)
+    pdf.cell(0, 12, "FieldKey", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_text_color(200, 200, 200)
     pdf.set_font("Helvetica", "", 10)
     pdf.set_x(15)
-    pdf.cell(0, 6, "Professional Locksmith Services", ln=True)
+    pdf.cell(0, 6, "Professional Locksmith Services", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # Invoice ID + date (right side)
     pdf.set_text_color(255, 255, 255)
@@ -306,10 +407,10 @@ def _generate_invoice_pdf(invoice_id, customer, service, amount, notes=""):
     # Bill To
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_text_color(100, 100, 100)
-    pdf.cell(0, 8, "BILL TO", ln=True)
+    pdf.cell(0, 8, "BILL TO", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "", 12)
     pdf.set_text_color(30, 30, 30)
-    pdf.cell(0, 7, customer, ln=True)
+    pdf.cell(0, 7, customer, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(10)
 
     # Table header
@@ -351,7 +452,7 @@ def _generate_invoice_pdf(invoice_id, customer, service, amount, notes=""):
     if notes:
         pdf.set_font("Helvetica", "B", 10)
         pdf.set_text_color(100, 100, 100)
-        pdf.cell(0, 8, "NOTES", ln=True)
+        pdf.cell(0, 8, "NOTES", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.set_font("Helvetica", "", 10)
         pdf.set_text_color(30, 30, 30)
         pdf.multi_cell(0, 6, notes)
@@ -361,8 +462,8 @@ def _generate_invoice_pdf(invoice_id, customer, service, amount, notes=""):
     pdf.set_y(-40)
     pdf.set_font("Helvetica", "", 9)
     pdf.set_text_color(150, 150, 150)
-    pdf.cell(0, 5, "Payment due within 30 days. Thank you for your business!", align="C", ln=True)
-    pdf.cell(0, 5, "FieldKey Locksmith Services | support@fieldkey.app | (555) 123-4567", align="C", ln=True)
+    pdf.cell(0, 5, "Payment due within 30 days. Thank you for your business!", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 5, "FieldKey Locksmith Services | support@fieldkey.app | (555) 123-4567", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     path = os.path.join(INVOICE_DIR, f"{invoice_id}.pdf")
     pdf.output(path)
@@ -373,36 +474,53 @@ def _generate_invoice_pdf(invoice_id, customer, service, amount, notes=""):
 # KEYWORD FALLBACK — when hybrid routing is unavailable
 # ══════════════════════════════════════════════════════════════════════
 
-def _keyword_fallback(messages, tools):
+_DEFAULT_TOOL_NAMES = frozenset(t["name"] for t in LOCKSMITH_TOOLS)
+
+# (pattern on lower-cased text, tool name, needs cloud) — extractors come from _EXTRACTORS
+_FALLBACK_PATTERNS = (
+    (r'diagnos|jammed|stuck|broken|won.?t turn|fault|malfunction|not working|lock issue',
+     "diagnose_lock_fault", False),
+    (r'log\s+service|service\s+report|report\s+for|completed|finished\s+job',
+     "log_service_report", False),
+    (r'checklist|pre.?job|safety\s+check',
+     "generate_checklist", False),
+    (r'look\s*up|part|key\s*blank|hardware|component|model\s+number',
+     "lookup_part", False),
+    (r'schedule|follow.?up|appointment|next\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
+     "schedule_followup", False),
+    (r'dispatch|backup|emergency|reinforcement|send\s+help',
+     "contact_dispatch", False),
+    (r'invoice|bill|charge|receipt|payment',
+     "generate_invoice", True),
+)
+
+# All patterns in one zero-width alternation: a single finditer pass reports the
+# tool matching at each position (no two tools' keywords share a start position)
+_FALLBACK_RE = _re.compile(
+    "(?=" + "|".join(f"(?P<{name}>{pattern})" for pattern, name, _ in _FALLBACK_PATTERNS) + ")"
+)
+
+
+def _join_user(messages):
+    """Concatenate the content of all user messages."""
+    return " ".join(m["content"] for m in messages if m.get("role") == "user")
+
+
+def _keyword_fallback(messages, tools, user_text=None):
     """Simple keyword-based tool matching when model routing is unavailable."""
-    user_text = " ".join(m["content"] for m in messages if m.get("role") == "user")
+    if user_text is None:
+        user_text = _join_user(messages)
     text_lower = user_text.lower()
     start = time.time()
 
-    patterns = [
-        (r'diagnos|jammed|stuck|broken|won.?t turn|fault|malfunction|not working|lock issue',
-         "diagnose_lock_fault", lambda t: _extract_diagnose_args(t), False),
-        (r'log\s+service|service\s+report|report\s+for|completed|finished\s+job',
-         "log_service_report", lambda t: _extract_report_args(t), False),
-        (r'checklist|pre.?job|safety\s+check',
-         "generate_checklist", lambda t: _extract_checklist_args(t), False),
-        (r'look\s*up|part|key\s*blank|hardware|component|model\s+number',
-         "lookup_part", lambda t: _extract_part_args(t), False),
-        (r'schedule|follow.?up|appointment|next\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
-         "schedule_followup", lambda t: _extract_followup_args(t), False),
-        (r'dispatch|backup|emergency|reinforcement|send\s+help',
-         "contact_dispatch", lambda t: _extract_dispatch_args(t), False),
-        (r'invoice|bill|charge|receipt|payment',
-         "generate_invoice", lambda t: _extract_invoice_args(t), True),
-    ]
-
-    tool_names = {t["name"] for t in tools}
+    tool_names = _DEFAULT_TOOL_NAMES if tools is LOCKSMITH_TOOLS else {t["name"] for t in tools}
+    matched = {m.lastgroup for m in _FALLBACK_RE.finditer(text_lower)}
     calls = []
     needs_cloud = False
 
-    for pattern, tool_name, extractor, is_cloud in patterns:
-        if tool_name in tool_names and _re.search(pattern, text_lower):
-            args = extractor(user_text)
+    for _, tool_name, is_cloud in _FALLBACK_PATTERNS:
+        if tool_name in tool_names and tool_name in matched:
+            args = _EXTRACTORS[tool_name](user_text)
             calls.append({"name": tool_name, "arguments": args})
             if is_cloud:
                 needs_cloud = True
@@ -415,12 +533,32 @@ def _keyword_fallback(messages, tools):
     }
 
 
+# Extraction patterns, compiled once at import
+_DIAGNOSE_LOCATION_RE = _re.compile(r'(?:on|at|for)\s+(?:the\s+)?(.+?(?:door|lock|gate|entrance|exit))', _re.IGNORECASE)
+_LOCK_TYPE_RE = _re.compile(r'(deadbolt|knob\s*lock|mortise|padlock|smart\s*lock|lever|cylinder)', _re.IGNORECASE)
+_REPORT_NAME_RE = _re.compile(r'(?:for|customer|client)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+_REPORT_SERVICE_RE = _re.compile(r'(rekey|lockout|lock\s*change|install|repair|master\s*key)', _re.IGNORECASE)
+_JOB_TYPE_RE = _re.compile(r'(residential\s+rekey|commercial\s+install|auto\s+lockout|rekey|lockout|install)', _re.IGNORECASE)
+_PART_QUERY_RE = _re.compile(r'(?:look\s*up|find|search\s+for)\s+(?:a\s+)?(.+?)(?:\s+for|\s*$)', _re.IGNORECASE)
+_BRAND_RE = _re.compile(r'(Schlage|Kwikset|Yale|Medeco|Mul-T-Lock|Baldwin|Sargent)', _re.IGNORECASE)
+_FOLLOWUP_NAME_RE = _re.compile(r'(?:with|for)\s+(?:Mrs?\.?\s+|Ms\.?\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+_FOLLOWUP_DATE_RE = _re.compile(r'(next\s+\w+|tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\w+\s+\d{1,2})', _re.IGNORECASE)
+_FOLLOWUP_REASON_RE = _re.compile(r'(?:for|to|about)\s+(.+?)(?:\s+next|\s+on|\s*$)', _re.IGNORECASE)
+_DISPATCH_REASON_RE = _re.compile(r'(?:need|require|requesting)\s+(.+?)(?:\.|$)', _re.IGNORECASE)
+_URGENCY_RE = _re.compile(r'(?P<emergency>emergency|urgent|asap|immediately)|(?P<high>backup|help|assist)', _re.IGNORECASE)
+_INVOICE_NAME_RE = _re.compile(r'(?:for|customer|client)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+_CAPITALIZED_NAME_RE = _re.compile(r'(?<!\w)([A-Z][a-z]+\s+[A-Z][a-z]+)')
+_INVOICE_SERVICE_RE = _re.compile(r'(rekey(?:ing)?|lockout|lock\s*change|install(?:ation)?|repair|master\s*key|deadbolt|lock\s+replacement)', _re.IGNORECASE)
+_AMOUNT_RE = _re.compile(r'\$[\d,]+(?:\.\d{2})?')
+_NOTES_RE = _re.compile(r'(?:notes?|memo|description)\s*:?\s*(.+?)(?:\.|$)', _re.IGNORECASE)
+
+
 def _extract_diagnose_args(text):
     args = {"symptoms": text}
-    loc_match = _re.search(r'(?:on|at|for)\s+(?:the\s+)?(.+?(?:door|lock|gate|entrance|exit))', text, _re.IGNORECASE)
+    loc_match = _DIAGNOSE_LOCATION_RE.search(text)
     if loc_match:
         args["location"] = loc_match.group(1).strip()
-    type_match = _re.search(r'(deadbolt|knob\s*lock|mortise|padlock|smart\s*lock|lever|cylinder)', text, _re.IGNORECASE)
+    type_match = _LOCK_TYPE_RE.search(text)
     if type_match:
         args["lock_type"] = type_match.group(1).strip()
     return args
@@ -428,28 +566,28 @@ def _extract_diagnose_args(text):
 
 def _extract_report_args(text):
     args = {"service_type": "service"}
-    name_match = _re.search(r'(?:for|customer|client)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', text)
+    name_match = _REPORT_NAME_RE.search(text)
     if name_match:
         args["customer_name"] = name_match.group(1).strip()
     else:
         args["customer_name"] = "Customer"
-    svc_match = _re.search(r'(rekey|lockout|lock\s*change|install|repair|master\s*key)', text, _re.IGNORECASE)
+    svc_match = _REPORT_SERVICE_RE.search(text)
     if svc_match:
         args["service_type"] = svc_match.group(1).strip()
     return args
 
 
 def _extract_checklist_args(text):
-    jt_match = _re.search(r'(residential\s+rekey|commercial\s+install|auto\s+lockout|rekey|lockout|install)', text, _re.IGNORECASE)
+    jt_match = _JOB_TYPE_RE.search(text)
     return {"job_type": jt_match.group(1).strip() if jt_match else "general"}
 
 
 def _extract_part_args(text):
     args = {"query": text}
-    part_match = _re.search(r'(?:look\s*up|find|search\s+for)\s+(?:a\s+)?(.+?)(?:\s+for|\s*$)', text, _re.IGNORECASE)
+    part_match = _PART_QUERY_RE.search(text)
     if part_match:
         args["query"] = part_match.group(1).strip().rstrip('.')
-    brand_match = _re.search(r'(Schlage|Kwikset|Yale|Medeco|Mul-T-Lock|Baldwin|Sargent)', text, _re.IGNORECASE)
+    brand_match = _BRAND_RE.search(text)
     if brand_match:
         args["brand"] = brand_match.group(1).strip()
     return args
@@ -457,15 +595,15 @@ def _extract_part_args(text):
 
 def _extract_followup_args(text):
     args = {"date": "TBD"}
-    name_match = _re.search(r'(?:with|for)\s+(?:Mrs?\.?\s+|Ms\.?\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', text)
+    name_match = _FOLLOWUP_NAME_RE.search(text)
     if name_match:
         args["customer_name"] = name_match.group(0).replace("with ", "").replace("for ", "").strip()
     else:
         args["customer_name"] = "Customer"
-    date_match = _re.search(r'(next\s+\w+|tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\w+\s+\d{1,2})', text, _re.IGNORECASE)
+    date_match = _FOLLOWUP_DATE_RE.search(text)
     if date_match:
         args["date"] = date_match.group(1).strip()
-    reason_match = _re.search(r'(?:for|to|about)\s+(.+?)(?:\s+next|\s+on|\s*$)', text, _re.IGNORECASE)
+    reason_match = _FOLLOWUP_REASON_RE.search(text)
     if reason_match:
         args["reason"] = reason_match.group(1).strip()
     return args
@@ -473,37 +611,37 @@ def _extract_followup_args(text):
 
 def _extract_dispatch_args(text):
     args = {"reason": text}
-    reason_match = _re.search(r'(?:need|require|requesting)\s+(.+?)(?:\.|$)', text, _re.IGNORECASE)
+    reason_match = _DISPATCH_REASON_RE.search(text)
     if reason_match:
         args["reason"] = reason_match.group(1).strip()
-    if _re.search(r'emergency|urgent|asap|immediately', text, _re.IGNORECASE):
-        args["urgency"] = "emergency"
-    elif _re.search(r'backup|help|assist', text, _re.IGNORECASE):
-        args["urgency"] = "high"
-    else:
-        args["urgency"] = "medium"
+    # One scan; any emergency keyword outranks backup/help wherever it appears
+    args["urgency"] = "medium"
+    for m in _URGENCY_RE.finditer(text):
+        args["urgency"] = m.lastgroup
+        if m.lastgroup == "emergency":
+            break
     return args
 
 
 def _extract_invoice_args(text):
     args = {"service_type": "Locksmith Service"}
     # Name: match "for Sarah Miller" or "customer Sarah Miller" etc.
-    name_match = _re.search(r'(?:for|customer|client)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', text)
+    name_match = _INVOICE_NAME_RE.search(text)
     if name_match:
         args["customer_name"] = name_match.group(1).strip()
     else:
         # Fallback: look for any two consecutive capitalized words
-        cap_match = _re.search(r'(?<!\w)([A-Z][a-z]+\s+[A-Z][a-z]+)', text)
+        cap_match = _CAPITALIZED_NAME_RE.search(text)
         if cap_match:
             args["customer_name"] = cap_match.group(1).strip()
         else:
             args["customer_name"] = "Customer"
     # Service type
-    svc_match = _re.search(r'(rekey(?:ing)?|lockout|lock\s*change|install(?:ation)?|repair|master\s*key|deadbolt|lock\s+replacement)', text, _re.IGNORECASE)
+    svc_match = _INVOICE_SERVICE_RE.search(text)
     if svc_match:
         args["service_type"] = svc_match.group(1).strip()
     # Amount: match $250, $250.00, $1,250.00 etc.
-    amt_match = _re.search(r'\$[\d,]+(?:\.\d{2})?', text)
+    amt_match = _AMOUNT_RE.search(text)
     if amt_match:
         raw = amt_match.group(0)
         # Normalize: add .00 if no decimal
@@ -512,7 +650,7 @@ def _extract_invoice_args(text):
         args["amount"] = raw
     else:
         args["amount"] = "$150.00"
-    notes_match = _re.search(r'(?:notes?|memo|description)\s*:?\s*(.+?)(?:\.|$)', text, _re.IGNORECASE)
+    notes_match = _NOTES_RE.search(text)
     if notes_match:
         args["notes"] = notes_match.group(1).strip()
     return args
@@ -533,7 +671,7 @@ _EXTRACTORS = {
 }
 
 # Values that indicate the model returned empty/default args
-_DEFAULT_VALUES = {"", "Customer", "Locksmith Service", "unknown", "none", "N/A"}
+_DEFAULT_VALUES = frozenset({"", "Customer", "Locksmith Service", "unknown", "none", "N/A"})
 
 
 def _enrich_arguments(name, args, user_text):
@@ -553,14 +691,27 @@ def _enrich_arguments(name, args, user_text):
 # JOB HISTORY — in-memory session store
 # ══════════════════════════════════════════════════════════════════════
 
-_job_history: list[dict] = []
+# Bounded: the oldest entries drop off once HISTORY_LIMIT is reached
+HISTORY_LIMIT = 10_000
+_job_history: deque[dict] = deque(maxlen=HISTORY_LIMIT)
+# Same entries indexed by tool name, so filtered queries don't scan everything
+_job_history_by_tool: dict[str, deque[dict]] = defaultdict(deque)
+
+
+def _record_history(entry: dict):
+    """Append to the history and its per-tool index (called from the event loop only)."""
+    if len(_job_history) == HISTORY_LIMIT:
+        oldest = _job_history[0]
+        _job_history_by_tool[oldest["name"]].popleft()
+    _job_history.append(entry)
+    _job_history_by_tool[entry["name"]].append(entry)
 
 
 # ══════════════════════════════════════════════════════════════════════
 # FASTAPI APP
 # ══════════════════════════════════════════════════════════════════════
 
-app = FastAPI(title="FieldKey Backend", version="1.0.0")
+app = FastAPI(title="FieldKey Backend", version="1.0.0", default_response_class=_JSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -577,184 +728,381 @@ class HybridRequest(BaseModel):
 
 @app.get("/api/health")
 async def health():
-    whisper_ok = os.path.exists(WHISPER_MODEL_PATH)
-    return {"status": "ok", "whisper_available": whisper_ok}
+    return {
+        "status": "ok",
+        "whisper_available": _whisper_available(),
+        "whisper_loaded": _whisper_model is not None,
+    }
 
 
 @app.get("/api/history")
 async def get_history(tool: Optional[str] = None):
     """Get job history, optionally filtered by tool name."""
     if tool:
-        filtered = [h for h in _job_history if h.get("name") == tool]
-        return {"history": filtered, "count": len(filtered)}
-    return {"history": _job_history, "count": len(_job_history)}
+        filtered = list(_job_history_by_tool.get(tool, ()))
+        return _JSONResponse({"history": filtered, "count": len(filtered)})
+    return _JSONResponse({"history": list(_job_history), "count": len(_job_history)})
 
 
 @app.get("/api/invoice/{invoice_id}")
 async def get_invoice(invoice_id: str):
     """Serve a generated invoice PDF."""
+    pending = _pending_invoices.get(invoice_id)
+    if pending is not None:
+        try:
+            await asyncio.wrap_future(pending)
+        except Exception:
+            return {"error": "Invoice generation failed"}
     path = os.path.join(INVOICE_DIR, f"{invoice_id}.pdf")
-    if not os.path.exists(path):
+    try:
+        stat_result = os.stat(path)
+    except OSError:
         return {"error": "Invoice not found"}
-    return FileResponse(path, media_type="application/pdf", filename=f"{invoice_id}.pdf")
+    # Hand over the stat we already have so FileResponse doesn't stat again
+    return FileResponse(path, media_type="application/pdf", filename=f"{invoice_id}.pdf", stat_result=stat_result)
+
+
+def _enrich_and_execute_one(call, user_text):
+    """Fill missing arguments from the user text, then run the call with mock tools."""
+    call["arguments"] = _enrich_arguments(
+        call["name"], call.get("arguments", {}), user_text
+    )
+    return {
+        "name": call["name"],
+        "arguments": call["arguments"],
+        "result": execute_tool(call["name"], call["arguments"]),
+    }
+
+
+async def _enrich_and_execute(function_calls, user_text):
+    """Run every call concurrently in worker threads; results keep the call order."""
+    return list(await asyncio.gather(
+        *(asyncio.to_thread(_enrich_and_execute_one, call, user_text) for call in function_calls)
+    ))
+
+
+# Routing results of recent requests, keyed by a digest of (messages, tools) (LRU).
+# Only the routing is reused; tool calls still execute on every request.
+# Only touched from the event loop, so no lock is needed.
+_ROUTE_CACHE_SIZE = 256
+_route_cache: OrderedDict[bytes, dict] = OrderedDict()
+
+
+def _copy_route(result: dict) -> dict:
+    """Copy a routing result deep enough that enrichment can't write into the cache."""
+    return {
+        **result,
+        "function_calls": [
+            {**call, "arguments": dict(call.get("arguments") or {})}
+            for call in result.get("function_calls", [])
+        ],
+    }
+
+
+async def _route(messages: list, tools: list, user_text: str) -> dict:
+    """generate_hybrid with the keyword fallback on error; repeated requests hit the cache."""
+    start = time.time()
+    key = hashlib.blake2b(
+        json.dumps([messages, tools], sort_keys=True, default=str).encode(), digest_size=16
+    ).digest()
+    cached = _route_cache.get(key)
+    if cached is not None:
+        _route_cache.move_to_end(key)
+        # Report the lookup's own latency, not the original routing run's
+        result = _copy_route(cached)
+        result["total_time_ms"] = (time.time() - start) * 1000
+        result["cached"] = True
+        return result
+
+    try:
+        result = await asyncio.to_thread(generate_hybrid, messages, tools)
+    except Exception as e:
+        print(f"[WARN] generate_hybrid failed: {e}", flush=True)
+        return await asyncio.to_thread(_keyword_fallback, messages, tools, user_text)
+
+    if result.get("function_calls"):
+        _route_cache[key] = _copy_route(result)
+        if len(_route_cache) > _ROUTE_CACHE_SIZE:
+            _route_cache.popitem(last=False)
+    return result
 
 
 @app.post("/api/hybrid")
 async def hybrid_endpoint(req: HybridRequest):
     """Run hybrid routing (edge/cloud) on locksmith tools."""
     tools = req.tools or LOCKSMITH_TOOLS
+    user_text = _join_user(req.messages)
     start = time.time()
 
-    try:
-        result = generate_hybrid(req.messages, tools)
-    except Exception as e:
-        print(f"[WARN] generate_hybrid failed: {e}")
-        result = _keyword_fallback(req.messages, tools)
+    # Routing and tool execution block, so they run in worker threads
+    result = await _route(req.messages, tools, user_text)
 
     # Always use wall-clock time so UI shows real latency
     elapsed = (time.time() - start) * 1000
 
-    # Enrich arguments with regex extraction for any missing values
-    user_text = " ".join(m["content"] for m in req.messages if m.get("role") == "user")
-    for call in result.get("function_calls", []):
-        call["arguments"] = _enrich_arguments(
-            call["name"], call.get("arguments", {}), user_text
-        )
+    executed = await _enrich_and_execute(result.get("function_calls", []), user_text)
+    source = result.get("source", "unknown")
+    latency_ms = round(elapsed, 1)
 
-    # Execute each function call with mock tools
-    executed = []
-    for call in result.get("function_calls", []):
-        tool_result = execute_tool(call["name"], call["arguments"])
-        entry = {
-            "name": call["name"],
-            "arguments": call["arguments"],
-            "result": tool_result,
-        }
-        executed.append(entry)
-        # Store in history
-        _job_history.append({
-            **entry,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "source": result.get("source", "unknown"),
-            "latency_ms": round(elapsed, 1),
-        })
+    # Store in history; entries from one request share the timestamp
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    for entry in executed:
+        _record_history({**entry, "timestamp": timestamp, "source": source, "latency_ms": latency_ms})
 
-    return {
+    return _JSONResponse({
         "function_calls": executed,
-        "source": result.get("source", "unknown"),
-        "latency_ms": round(elapsed, 1),
-    }
-
-
-_thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
-
-
-def _convert_to_wav(input_path: str) -> str:
-    """Convert any audio file to 16kHz mono WAV using ffmpeg."""
+        "source": source,
+        "cached": result.get("cached", False),
+        "latency_ms": latency_ms,
+    })
+
+
+# One decode per Whisper handle, at most WHISPER_WORKERS at once; ffmpeg and
+# hashing go to a separate pool so they never queue behind a running decode
+_whisper_exec = concurrent.futures.ThreadPoolExecutor(max_workers=WHISPER_WORKERS, thread_name_prefix="whisper")
+_io_exec = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="io")
+
+# The one in-flight Whisper load, shared by the startup preload and early requests
+_whisper_load: Optional[asyncio.Future] = None
+
+
+async def _await_whisper():
+    """
+    Whisper handle once loaded, else None. Concurrent callers wait on a single
+    load instead of racing cactus_init; a failed or missing load is retried.
+    """
+    global _whisper_load
+    if _whisper_model is not None:
+        return _whisper_model
+    if _whisper_load is None or _whisper_load.done():
+        _whisper_load = asyncio.get_running_loop().run_in_executor(_whisper_exec, _get_whisper)
+    return await asyncio.shield(_whisper_load)
+
+
+def _resample_in_process(input_path: str, wav_path: str) -> bool:
+    """Decode with libsndfile and resample with soxr; False if unavailable or unreadable."""
+    if soundfile is None:
+        return False
+    try:
+        data, sr = soundfile.read(input_path, dtype="float32", always_2d=True)
+        mono = data.mean(axis=1)
+        if sr != 16000:
+            mono = soxr.resample(mono, sr, 16000)
+        soundfile.write(wav_path, mono, 16000, subtype="PCM_16")
+        return True
+    except RuntimeError as e:
+        # libsndfile decode errors (soundfile.LibsndfileError subclasses RuntimeError),
+        # e.g. m4a/aac it can't read; anything else is a real bug and propagates
+        print(f"[DEBUG] In-process decode failed, falling back to ffmpeg: {e}", flush=True)
+        return False
+
+
+async def _convert_to_wav(input_path: str) -> str:
+    """
+    Convert any audio file to 16kHz mono WAV, in-process when possible, else with
+    ffmpeg. ffmpeg runs as an asyncio subprocess, so no worker thread waits on it.
+    """
     wav_path = input_path.rsplit(".", 1)[0] + ".wav"
     print(f"[DEBUG] Converting {input_path} -> {wav_path}", flush=True)
+    loop = asyncio.get_running_loop()
+    if await loop.run_in_executor(_io_exec, _resample_in_process, input_path, wav_path):
+        print(f"[DEBUG] Converted in-process: {os.path.getsize(wav_path)} bytes", flush=True)
+        return wav_path
     try:
-        r = subprocess.run(
-            ["ffmpeg", "-y", "-i", input_path, "-ar", "16000", "-ac", "1", "-f", "wav", wav_path],
-            capture_output=True, timeout=10,
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-y", "-i", input_path, "-ar", "16000", "-ac", "1", "-f", "wav", wav_path,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
         )
-        if r.returncode != 0:
-            print(f"[WARN] ffmpeg error: {r.stderr.decode()[:200]}", flush=True)
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        if proc.returncode != 0:
+            print(f"[WARN] ffmpeg error: {stderr.decode()[:200]}", flush=True)
         if os.path.exists(wav_path) and os.path.getsize(wav_path) > 0:
             print(f"[DEBUG] Converted OK: {os.path.getsize(wav_path)} bytes", flush=True)
             return wav_path
     except Exception as e:
-        print(f"[WARN] ffmpeg conversion failed: {e}", flush=True)
+        print(f"[WARN] ffmpeg conversion failed: {e!r}", flush=True)
     return input_path  # fallback to original
 
 
-_whisper_lock = threading.Lock()
+# Transcripts of recent uploads, keyed by SHA-256 of the audio bytes (LRU).
+# Only touched from the event loop, so no lock is needed.
+_TRANSCRIPT_CACHE_SIZE = 128
+_transcript_cache: OrderedDict[str, str] = OrderedDict()
 
 
-def _do_transcribe(whisper, audio_path: str) -> tuple:
-    """Run transcription in a thread (blocking). Uses lock for thread safety."""
-    # Convert to WAV if not already
-    wav_path = audio_path
-    if not audio_path.endswith(".wav"):
-        wav_path = _convert_to_wav(audio_path)
+def _audio_digest(audio_path: str) -> str:
+    h = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
 
-    with _whisper_lock:
+def _run_whisper(wav_path: str) -> tuple:
+    """
+    Decode one clip (blocking) on a handle from the preloaded pool, waiting
+    for one to come free. Runs only on _whisper_exec.
+    """
+    whisper = _whisper_idle.get()
+    try:
         cactus_reset(whisper)  # Clear KV cache between transcriptions
         start = time.time()
         prompt = "<|startoftranscript|><|en|><|transcribe|><|notimestamps|>"
         raw = cactus_transcribe(whisper, wav_path, prompt=prompt)
         elapsed = (time.time() - start) * 1000
+    finally:
+        _whisper_idle.put(whisper)
 
-    result = json.loads(raw) if isinstance(raw, str) else raw
+    result = _json_loads(raw) if isinstance(raw, str) else raw
     text = (result.get("response") or "").strip() if isinstance(result, dict) else ""
     print(f"[DEBUG] Transcription result: '{text}' ({elapsed:.0f}ms)", flush=True)
+    return text, elapsed
+
+
+# In-flight transcriptions by audio digest, so concurrent identical uploads share one decode
+_inflight_transcripts: dict[str, asyncio.Task] = {}
+
+
+def _discard(path: str):
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+async def _transcribe(audio_path: str) -> tuple:
+    """
+    Transcribe an audio file: hash and convert on _io_exec, decode on _whisper_exec.
+    Takes ownership of audio_path: it is deleted here, or by the decode task it
+    starts, so a caller going away can't pull the file from under other waiters.
+    """
+    loop = asyncio.get_running_loop()
+    handed_off = False
+    try:
+        # Identical audio (retries, replays) skips conversion and decoding
+        lookup_start = time.time()
+        digest = await loop.run_in_executor(_io_exec, _audio_digest, audio_path)
+        cached = _transcript_cache.get(digest)
+        if cached is not None:
+            _transcript_cache.move_to_end(digest)
+            elapsed = (time.time() - lookup_start) * 1000
+            print(f"[DEBUG] Transcription cache hit: '{cached}' ({elapsed:.0f}ms)", flush=True)
+            return cached, elapsed
+
+        task = _inflight_transcripts.get(digest)
+        if task is None:
+            task = asyncio.ensure_future(_transcribe_uncached(audio_path, digest))
+            handed_off = True
+            _inflight_transcripts[digest] = task
+            task.add_done_callback(lambda _: _inflight_transcripts.pop(digest, None))
+    finally:
+        if not handed_off:
+            _discard(audio_path)
+    # Shielded so one caller going away doesn't cancel the decode for the others
+    return await asyncio.shield(task)
+
 
-    # Cleanup converted file
-    if wav_path != audio_path and os.path.exists(wav_path):
-        os.unlink(wav_path)
+async def _transcribe_uncached(audio_path: str, digest: str) -> tuple:
+    """Convert and decode one clip; owns audio_path and deletes it when done."""
+    loop = asyncio.get_running_loop()
+
+    wav_path = audio_path
+    try:
+        # Convert to WAV if not already
+        if not audio_path.endswith(".wav"):
+            wav_path = await _convert_to_wav(audio_path)
+        text, elapsed = await loop.run_in_executor(_whisper_exec, _run_whisper, wav_path)
+    finally:
+        # Cleanup the upload and any converted file
+        _discard(audio_path)
+        if wav_path != audio_path:
+            _discard(wav_path)
+
+    if text:
+        _transcript_cache[digest] = text
+        if len(_transcript_cache) > _TRANSCRIPT_CACHE_SIZE:
+            _transcript_cache.popitem(last=False)
 
     return text, elapsed
 
 
+# cactus_transcribe only takes a file path, so keep uploads (and the WAVs
+# converted next to them) on tmpfs where available instead of disk
+_AUDIO_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+def _save_upload(audio: UploadFile, suffix: str) -> str:
+    """Copy an upload to a temp file in 1 MiB chunks rather than reading it into memory."""
+    audio.file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False, dir=_AUDIO_TMP_DIR) as tmp:
+        shutil.copyfileobj(audio.file, tmp, 1024 * 1024)
+        return tmp.name
+
+
+def _warm_whisper():
+    """
+    Decode a second of silence so the first real clip doesn't pay for lazy
+    init. Blocking; runs on _whisper_exec like any other decode.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False, dir=_AUDIO_TMP_DIR) as tmp:
+        path = tmp.name
+    try:
+        with wave.open(path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(b"\x00\x00" * 16000)
+        _run_whisper(path)
+    finally:
+        os.unlink(path)
+
+
 @app.post("/api/transcribe")
 async def transcribe_endpoint(audio: UploadFile = File(...)):
     """Transcribe audio using on-device Whisper."""
-    loop = asyncio.get_event_loop()
-    whisper = await loop.run_in_executor(_thread_pool, _get_whisper)
+    whisper = await _await_whisper()
     if whisper is None:
         return {"error": "Whisper model not available", "text": ""}
 
     # Save uploaded file
     ext = os.path.splitext(audio.filename or "audio.wav")[1] or ".wav"
-    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-        content = await audio.read()
-        tmp.write(content)
-        tmp_path = tmp.name
+    tmp_path = await asyncio.to_thread(_save_upload, audio, ext)
 
+    # _transcribe owns and deletes tmp_path
     try:
-        text, elapsed = await loop.run_in_executor(
-            _thread_pool, _do_transcribe, whisper, tmp_path
-        )
+        text, elapsed = await _transcribe(tmp_path)
         return {"text": text, "latency_ms": round(elapsed, 1)}
     except Exception as e:
         return {"error": str(e), "text": ""}
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+
+
+async def _transcribe_upload(audio: UploadFile) -> tuple:
+    """Save and transcribe a voice upload; ("", 0) when Whisper is missing or fails."""
+    whisper = await _await_whisper()
+    if whisper is None:
+        # No model: skip the upload and return an empty transcription
+        return "", 0
+
+    ext = os.path.splitext(audio.filename or "audio.m4a")[1] or ".m4a"
+    print(f"[DEBUG] Voice upload: filename={audio.filename}, ext={ext}", flush=True)
+    tmp_path = await asyncio.to_thread(_save_upload, audio, ext)
+
+    # _transcribe owns and deletes tmp_path
+    try:
+        return await _transcribe(tmp_path)
+    except Exception as e:
+        print(f"[WARN] Transcription failed: {e}", flush=True)
+        return "", 0
 
 
 @app.post("/api/process_voice")
 async def process_voice_endpoint(audio: UploadFile = File(...)):
     """Combined: transcribe audio then run hybrid routing."""
-    loop = asyncio.get_event_loop()
-    whisper = await loop.run_in_executor(_thread_pool, _get_whisper)
-
     # Step 1: Transcribe
-    transcribe_text = ""
-    transcribe_ms = 0
-
-    if whisper is not None:
-        ext = os.path.splitext(audio.filename or "audio.m4a")[1] or ".m4a"
-        print(f"[DEBUG] Voice upload: filename={audio.filename}, ext={ext}", flush=True)
-        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            content = await audio.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            transcribe_text, transcribe_ms = await loop.run_in_executor(
-                _thread_pool, _do_transcribe, whisper, tmp_path
-            )
-        except Exception as e:
-            print(f"[WARN] Transcription failed: {e}", flush=True)
-            transcribe_text = ""
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-    else:
-        # Read audio but return empty transcription
-        await audio.read()
-        transcribe_text = ""
+    transcribe_text, transcribe_ms = await _transcribe_upload(audio)
 
     if not transcribe_text:
         return {
@@ -768,51 +1116,102 @@ async def process_voice_endpoint(audio: UploadFile = File(...)):
     # Step 2: Hybrid routing (with fallback)
     messages = [{"role": "user", "content": transcribe_text}]
     start = time.time()
-    try:
-        hybrid_result = generate_hybrid(messages, LOCKSMITH_TOOLS)
-    except Exception as e:
-        print(f"[WARN] generate_hybrid failed in voice: {e}", flush=True)
-        hybrid_result = _keyword_fallback(messages, LOCKSMITH_TOOLS)
+    hybrid_result = await _route(messages, LOCKSMITH_TOOLS, transcribe_text)
     routing_ms = (time.time() - start) * 1000
 
-    # Enrich arguments
-    for call in hybrid_result.get("function_calls", []):
-        call["arguments"] = _enrich_arguments(
-            call["name"], call.get("arguments", {}), transcribe_text
-        )
+    executed = await _enrich_and_execute(hybrid_result.get("function_calls", []), transcribe_text)
 
-    executed = []
-    for call in hybrid_result.get("function_calls", []):
-        tool_result = execute_tool(call["name"], call["arguments"])
-        executed.append({
-            "name": call["name"],
-            "arguments": call["arguments"],
-            "result": tool_result,
-        })
-
-    return {
+    return _JSONResponse({
         "transcription": transcribe_text,
         "transcribe_latency_ms": round(transcribe_ms, 1),
         "function_calls": executed,
         "source": hybrid_result.get("source", "unknown"),
+        "cached": hybrid_result.get("cached", False),
         "routing_latency_ms": round(hybrid_result.get("total_time_ms", routing_ms), 1),
-    }
+    })
+
+
+@app.post("/api/process_voice/stream")
+async def process_voice_stream_endpoint(audio: UploadFile = File(...)):
+    """
+    /api/process_voice as NDJSON, one object per line, sent as each stage finishes:
+    {"transcription", "transcribe_latency_ms"}, then {"source", "cached",
+    "routing_latency_ms", "call_count"}, then {"index", "function_call"} per call in completion order.
+    """
+    transcribe_text, transcribe_ms = await _transcribe_upload(audio)
+
+    async def _execute_indexed(index, call):
+        return index, await asyncio.to_thread(_enrich_and_execute_one, call, transcribe_text)
+
+    async def lines():
+        yield _json_dumps({
+            "transcription": transcribe_text,
+            "transcribe_latency_ms": round(transcribe_ms, 1),
+        }) + b"\n"
+        if not transcribe_text:
+            yield _json_dumps({"source": "none", "routing_latency_ms": 0, "call_count": 0}) + b"\n"
+            return
+
+        messages = [{"role": "user", "content": transcribe_text}]
+        start = time.time()
+        hybrid_result = await _route(messages, LOCKSMITH_TOOLS, transcribe_text)
+        routing_ms = (time.time() - start) * 1000
+        calls = hybrid_result.get("function_calls", [])
+        yield _json_dumps({
+            "source": hybrid_result.get("source", "unknown"),
+            "cached": hybrid_result.get("cached", False),
+            "routing_latency_ms": round(hybrid_result.get("total_time_ms", routing_ms), 1),
+            "call_count": len(calls),
+        }) + b"\n"
+
+        for done in asyncio.as_completed([_execute_indexed(i, call) for i, call in enumerate(calls)]):
+            index, entry = await done
+            yield _json_dumps({"index": index, "function_call": entry}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def _preload():
+    print("[INFO] Pre-loading Whisper model...")
+    loop = asyncio.get_running_loop()
+    try:
+        w = await _await_whisper()
+    except Exception as e:
+        print(f"[WARN] Whisper model failed to load: {e}")
+        w = None
+    if w:
+        print("[INFO] Whisper model loaded successfully")
+        try:
+            # One warm-up per handle; concurrent, so each lands on a different one
+            await asyncio.gather(*(
+                loop.run_in_executor(_whisper_exec, _warm_whisper) for _ in range(_whisper_pool_size)
+            ))
+        except Exception as e:
+            print(f"[WARN] Whisper warm-up failed: {e}")
+    else:
+        print("[WARN] Whisper model failed to load")
+    try:
+        await asyncio.to_thread(warm_up, LOCKSMITH_TOOLS)
+        print("[INFO] FunctionGemma and tool caches warmed")
+    except Exception as e:
+        print(f"[WARN] FunctionGemma warm-up failed: {e}")
+
+
+# Held so the preload task isn't garbage-collected mid-run
+_preload_task: Optional[asyncio.Task] = None
 
 
 @app.on_event("startup")
 async def startup_preload():
-    """Pre-load Whisper model in background thread at startup."""
-    import threading
-    def _load():
-        print("[INFO] Pre-loading Whisper model...")
-        w = _get_whisper()
-        if w:
-            print("[INFO] Whisper model loaded successfully")
-        else:
-            print("[WARN] Whisper model failed to load")
-    threading.Thread(target=_load, daemon=True).start()
+    """Pre-load Whisper and FunctionGemma in the background at startup."""
+    global _preload_task
+    _preload_task = asyncio.create_task(_preload())
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker by default: each worker loads its own models and keeps its
+    # own history and in-flight invoices, so WEB_CONCURRENCY > 1 suits
+    # stateless /api/hybrid traffic on hosts with the memory for N model copies.
+    workers = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+    uvicorn.run("server:app" if workers > 1 else app, host="0.0.0.0", port=8000, workers=workers)